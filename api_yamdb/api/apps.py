@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Интерфейс программирования приложений'
+
+    def ready(self):
+        from api.signals import reset_autocomplete, reset_response_cache
+        reviews_config = self.apps.get_app_config('reviews')
+        post_migrate.connect(reset_autocomplete, sender=reviews_config)
+        post_migrate.connect(reset_response_cache, sender=reviews_config)
@@ -0,0 +1,76 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from api_yamdb.constants import ROLE_ADMIN, ROLE_MODERATOR
+from users.cache import accounts
+from users.tokens import (ROLE_CLAIM, STAFF_CLAIM, VERSION_CLAIM,
+                          get_token_version)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Пользователь, восстановленный из утверждений токена.
+
+    Даёт разрешениям id, роль и статус администратора без запроса
+    к базе. Где нужна строка Account, её загружают по `pk`.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @cached_property
+    def is_staff(self):
+        return self.token[STAFF_CLAIM]
+
+    @property
+    def is_moderator(self):
+        return self.role == ROLE_MODERATOR
+
+    def is_admin(self):
+        return self.role == ROLE_ADMIN or self.is_staff
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без загрузки пользователя из базы.
+
+    Токен с ролью и версией токенов превращается в ClaimsUser; версия
+    сверяется с кэшированной версией пользователя, поэтому смена роли
+    или отзыв токенов делают старые токены недействительными. Для токенов
+    без этих утверждений Account берётся из LRU-кэша процесса.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        if (
+            ROLE_CLAIM not in validated_token
+            or VERSION_CLAIM not in validated_token
+        ):
+            return self.get_account(user_id, validated_token)
+        if get_token_version(user_id) != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked'
+            )
+        return ClaimsUser(validated_token)
+
+    def get_account(self, user_id, validated_token):
+        """
+        Account из кэша; промах загружает и проверяет его как обычно.
+
+        С CHECK_REVOKE_TOKEN хэш пароля сверяется для каждого токена,
+        поэтому кэш тогда не используется.
+        """
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        return accounts.get(
+            user_id,
+            lambda: super(StatelessJWTAuthentication, self).get_user(
+                validated_token
+            )
+        )
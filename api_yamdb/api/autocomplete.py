@@ -0,0 +1,226 @@
+from bisect import bisect_left, insort
+from threading import RLock, Thread
+from time import monotonic
+
+from django.db import connections
+
+from api import cache
+from api_yamdb.constants import AUTOCOMPLETE_INDEX_TIMEOUT
+from reviews.models import Category, Genre, Title
+from reviews.search import normalize as normalize_yo
+
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+KINDS = (TITLES, GENRES, CATEGORIES)
+# Общая версия названий в api.cache: её увеличивает каждая запись,
+# меняющая индекс, в любом процессе.
+VERSION_RESOURCE = 'autocomplete'
+
+
+def normalize(text):
+    """Приводит название к ключу индекса: регистр, ё, пробелы."""
+    return ' '.join(normalize_yo(text).casefold().split())
+
+
+def word_suffixes(name):
+    """Ключи для поиска по началу любого слова названия."""
+    key = normalize(name)
+    starts = [0] + [
+        position + 1 for position, char in enumerate(key) if char == ' '
+    ]
+    return [key[start:] for start in starts]
+
+
+class PrefixIndex:
+    """
+    Отсортированный префиксный индекс названий в памяти процесса.
+
+    Поиск — бинарный поиск по списку ключей без обращения к базе.
+    Индекс строится при первом запросе и далее обновляется
+    сигналами моделей своего процесса. Записи других процессов
+    замечаются по общей версии VERSION_RESOURCE: если она ушла дальше
+    собственных записей, индекс перестраивается. С кэшем в памяти
+    процесса (locmem) версия не общая, поэтому индекс дополнительно
+    перестраивается раз в AUTOCOMPLETE_INDEX_TIMEOUT секунд.
+
+    Повторная перестройка идёт в фоновом потоке: пока она читает базу,
+    запросы обслуживает прежний индекс, а готовый индекс подменяется
+    целиком. Собственные записи, сделанные за время перестройки,
+    применяются к новому индексу повторно.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._built = False
+        self._version = None
+        self._expires = 0.0
+        self._keys = []
+        self._entries = {}
+        self._generation = 0
+        self._loading = 0
+        self._rebuild = None
+        self._pending = []
+
+    def _add(self, kind, ident, name, payload):
+        keys = [(key, kind, ident) for key in word_suffixes(name)]
+        for key in keys:
+            insort(self._keys, key)
+        self._entries[(kind, ident)] = (keys, payload)
+
+    def _remove(self, kind, ident):
+        keys, _ = self._entries.pop((kind, ident), ((), None))
+        for key in keys:
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def _apply(self, version, kind, ident, items):
+        """
+        Обновляет записи items — список (id, name, payload) — или, если
+        items равен None, удаляет запись ident; принимает версию записи.
+        """
+        if items is None:
+            self._remove(kind, ident)
+        else:
+            for ident, name, payload in items:
+                self._remove(kind, ident)
+                self._add(kind, ident, name, payload)
+        # Чужие записи между нашими оставляют версию позади общей,
+        # и следующий поиск запустит перестройку.
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+
+    @staticmethod
+    def load():
+        """Записи индекса и отсортированные ключи из базы."""
+        entries = {}
+        for title in Title.objects.values('id', 'name', 'year'):
+            entries[(TITLES, title['id'])] = (
+                [(key, TITLES, title['id'])
+                 for key in word_suffixes(title['name'])],
+                title
+            )
+        for kind, model in ((GENRES, Genre), (CATEGORIES, Category)):
+            for item in model.objects.values('id', 'name', 'slug'):
+                entries[(kind, item['id'])] = (
+                    [(key, kind, item['id'])
+                     for key in word_suffixes(item['name'])],
+                    {'name': item['name'], 'slug': item['slug']}
+                )
+        keys = sorted(key for keys, _ in entries.values() for key in keys)
+        return entries, keys
+
+    def build(self, version=None):
+        """Полностью перестраивает индекс по базе."""
+        if version is None:
+            version, = cache.get_versions((VERSION_RESOURCE,))
+        with self._lock:
+            generation = self._generation
+            self._loading += 1
+        loaded = None
+        try:
+            loaded = self.load()
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if loaded is not None and generation == self._generation:
+                    self._entries, self._keys = loaded
+                    self._built = True
+                    self._version = version
+                    self._expires = (
+                        monotonic() + AUTOCOMPLETE_INDEX_TIMEOUT
+                    )
+                    for change in self._pending:
+                        self._apply(*change)
+                if not self._loading:
+                    self._pending = []
+
+    def _rebuild_in_background(self, version):
+        try:
+            self.build(version)
+        finally:
+            connections.close_all()
+            with self._lock:
+                self._rebuild = None
+
+    def wait(self, timeout=None):
+        """Ждёт окончания фоновой перестройки, если она идёт."""
+        rebuild = self._rebuild
+        if rebuild is not None:
+            rebuild.join(timeout)
+
+    def reset(self):
+        """Сбрасывает индекс; он будет перестроен при следующем поиске."""
+        cache.bump_version(VERSION_RESOURCE)
+        with self._lock:
+            self._generation += 1
+            self._built = False
+            self._keys = []
+            self._entries = {}
+            self._pending = []
+
+    def update(self, kind, ident, name, payload):
+        self.update_many(kind, [(ident, name, payload)])
+
+    def update_many(self, kind, items):
+        """Обновляет названия (id, name, payload) одной записью версии."""
+        self._change(kind, None, items)
+
+    def remove(self, kind, ident):
+        self._change(kind, ident, None)
+
+    def _change(self, kind, ident, items):
+        with self._lock:
+            version, = cache.bump_version(VERSION_RESOURCE)
+            change = (version, kind, ident, items)
+            if self._loading:
+                # Загрузка могла прочитать базу до этой записи.
+                self._pending.append(change)
+            if self._built:
+                self._apply(*change)
+
+    def search(self, prefix, limit):
+        """Возвращает до `limit` совпадений каждого типа по префиксу."""
+        prefix = normalize(prefix)
+        results = {kind: [] for kind in KINDS}
+        if not prefix:
+            return results
+        version, = cache.get_versions((VERSION_RESOURCE,))
+        was_built = self._built
+        if not self._built:
+            self.build(version)
+        with self._lock:
+            if (
+                was_built and self._rebuild is None
+                and (version != self._version
+                     or monotonic() >= self._expires)
+            ):
+                self._rebuild = Thread(
+                    target=self._rebuild_in_background, args=(version,),
+                    name='autocomplete-rebuild', daemon=True
+                )
+                self._rebuild.start()
+            seen = set()
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys):
+                key, kind, ident = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if (kind, ident) in seen or len(results[kind]) >= limit:
+                    continue
+                seen.add((kind, ident))
+                results[kind].append(self._entries[(kind, ident)][1])
+        return results
+
+
+index = PrefixIndex()
+
+
+def title_payload(title):
+    return {'id': title.pk, 'name': title.name, 'year': title.year}
+
+
+def dimension_payload(instance):
+    return {'name': instance.name, 'slug': instance.slug}
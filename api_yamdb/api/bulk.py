@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models import Value
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.signals import titles_bulk_saved
+
+CREATED = 'created'
+UPDATED = 'updated'
+ERROR = 'error'
+UPDATE_FIELDS = ('name', 'year', 'description', 'category', 'updated_at')
+
+
+def resolve_slugs(genre_slugs, category_slugs):
+    """
+    Находит id жанров и категорий по слагам одним запросом.
+
+    Возвращает пару словарей slug -> id для жанров и категорий.
+    """
+    genres = (
+        Genre.objects.order_by().filter(slug__in=genre_slugs)
+        .annotate(kind=Value('genre'))
+        .values_list('slug', 'id', 'kind')
+    )
+    categories = (
+        Category.objects.order_by().filter(slug__in=category_slugs)
+        .annotate(kind=Value('category'))
+        .values_list('slug', 'id', 'kind')
+    )
+    resolved = {'genre': {}, 'category': {}}
+    for slug, pk, kind in genres.union(categories, all=True):
+        resolved[kind][slug] = pk
+    return resolved['genre'], resolved['category']
+
+
+def check_item(item, genre_ids, category_ids, existing, seen_ids):
+    """Ошибки ссылок элемента: неизвестные слаги и id произведения."""
+    errors = {}
+    unknown = sorted(set(item['genre']) - genre_ids.keys())
+    if unknown:
+        errors['genre'] = [f'Жанры не найдены: {", ".join(unknown)}.']
+    if item['category'] not in category_ids:
+        errors['category'] = [f'Категория не найдена: {item["category"]}.']
+    title_id = item.get('id')
+    if title_id and title_id not in existing:
+        errors['id'] = [f'Произведение {title_id} не найдено.']
+    elif title_id and title_id in seen_ids:
+        errors['id'] = [f'Произведение {title_id} указано повторно.']
+    return errors
+
+
+def bulk_save_titles(items):
+    """
+    Создаёт и обновляет произведения пачкой.
+
+    items — провалидированные данные элементов (или None для элементов
+    с ошибками, их результат уже сформирован). Элементы с `id`
+    обновляются, остальные создаются. Возвращает результаты по каждому
+    элементу в исходном порядке.
+    """
+    results = [None] * len(items)
+    genre_ids, category_ids = resolve_slugs(
+        {slug for item in items if item for slug in item['genre']},
+        {item['category'] for item in items if item},
+    )
+    existing = Title.objects.in_bulk(
+        [item['id'] for item in items if item and item.get('id')]
+    )
+    to_create, to_update = [], []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        errors = check_item(item, genre_ids, category_ids, existing, seen_ids)
+        title_id = item.get('id')
+        seen_ids.add(title_id)
+        if errors:
+            results[index] = {'status': ERROR, 'errors': errors}
+            continue
+        title = existing[title_id] if title_id else Title()
+        title.name = item['name']
+        title.year = item['year']
+        title.description = item.get('description', '')
+        title.category_id = category_ids[item['category']]
+        genres = {genre_ids[slug] for slug in item['genre']}
+        (to_update if title_id else to_create).append((index, title, genres))
+
+    with transaction.atomic():
+        Title.objects.bulk_create([title for _, title, _ in to_create])
+        now = timezone.now()
+        for _, title, _ in to_update:
+            title.updated_at = now
+        Title.objects.bulk_update(
+            [title for _, title, _ in to_update], UPDATE_FIELDS
+        )
+        TitleGenre.objects.filter(
+            title_id__in=[title.pk for _, title, _ in to_update]
+        ).delete()
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title_id=title.pk, genre_id=genre_id)
+            for _, title, genres in to_create + to_update
+            for genre_id in genres
+        )
+        titles_bulk_saved.send(
+            sender=Title,
+            created=[title for _, title, _ in to_create],
+            updated=[title for _, title, _ in to_update],
+        )
+
+    for status, batch in ((CREATED, to_create), (UPDATED, to_update)):
+        for index, title, _ in batch:
+            results[index] = {'status': status, 'id': title.pk}
+    return results
@@ -0,0 +1,133 @@
+from hashlib import md5
+from time import time
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb.constants import RESPONSE_CACHE_TIMEOUT
+
+TITLES = 'titles'
+CATEGORIES = 'categories'
+GENRES = 'genres'
+RESOURCES = (TITLES, CATEGORIES, GENRES)
+
+VERSION_KEY = 'api:version:{resource}'
+RESPONSE_KEY = 'api:response:{resource}:{digest}'
+STATS_KEY = 'api:cache-stats:{resource}:{outcome}'
+HIT = 'hits'
+MISS = 'misses'
+
+
+def _increment(key, initial):
+    """Атомарно увеличивает счётчик в кэше, создавая его при отсутствии."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, initial)
+        return cache.incr(key)
+
+
+def get_versions(resources):
+    """
+    Текущие версии ресурсов.
+
+    Новые счётчики начинаются с отметки времени, чтобы после вытеснения
+    ключа из кэша версия не совпала со старой.
+    """
+    keys = {VERSION_KEY.format(resource=name): name for name in resources}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, int(time() * 1000))
+        versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_version(*resources):
+    """Инвалидирует закэшированные ответы ресурсов; возвращает версии."""
+    return tuple(
+        _increment(VERSION_KEY.format(resource=resource), int(time() * 1000))
+        for resource in resources
+    )
+
+
+def record(resource, outcome):
+    _increment(STATS_KEY.format(resource=resource, outcome=outcome), 0)
+
+
+def get_stats():
+    """Число попаданий и промахов кэша ответов по ресурсам."""
+    keys = {
+        STATS_KEY.format(resource=resource, outcome=outcome):
+            (resource, outcome)
+        for resource in RESOURCES for outcome in (HIT, MISS)
+    }
+    values = cache.get_many(keys)
+    stats = {resource: {HIT: 0, MISS: 0} for resource in RESOURCES}
+    for key, (resource, outcome) in keys.items():
+        stats[resource][outcome] = values.get(key, 0)
+    return stats
+
+
+def response_key(request, action, kwargs, resource, versions):
+    """Ключ ответа: версии ресурсов, действие и нормализованные параметры."""
+    params = sorted(
+        (name, sorted(values))
+        for name, values in request.query_params.lists()
+    )
+    signature = repr((
+        request.scheme, request.get_host(), action,
+        sorted(kwargs.items()), params, versions
+    ))
+    return RESPONSE_KEY.format(
+        resource=resource, digest=md5(signature.encode()).hexdigest()
+    )
+
+
+class VersionedCacheMixin:
+    """
+    Кэширует данные ответов безопасных методов вьюсета.
+
+    Ключ включает версии ресурсов из `cache_resources`: любая запись
+    в них увеличивает версию, и старые ответы перестают находиться.
+    """
+
+    cache_resources = ()
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        resource = self.cache_resources[0]
+        key = response_key(
+            request, self.action, kwargs, resource,
+            get_versions(self.cache_resources)
+        )
+        data = cache.get(key)
+        if data is not None:
+            record(resource, HIT)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        record(resource, MISS)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, self.cache_timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(VersionedCacheMixin):
+    """Кэширование списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(VersionedCacheMixin):
+    """Кэширование отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,58 @@
+from hashlib import md5
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+
+def make_etag(*parts):
+    """ETag из значений-валидаторов ресурса."""
+    return quote_etag(md5(repr(parts).encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Ответ 304 Not Modified по ETag и Last-Modified.
+
+    Валидаторы вычисляются дешёвым запросом в `get_validators()`, и при
+    совпадении с заголовками клиента сериализатор не запускается.
+    """
+
+    def get_validators(self, request):
+        """Возвращает пару (etag, last_modified) или None."""
+        return None
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp())
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if not_modified is not None:
+            return not_modified
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Условный GET для списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Условный GET для отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,94 @@
+from threading import Lock
+from time import monotonic
+
+from api import cache
+from api_yamdb.constants import DIMENSION_CACHE_TIMEOUT
+from reviews.models import Category, Genre
+
+
+class DimensionCache:
+    """
+    Снимок маленькой справочной таблицы (id, slug, name) в памяти процесса.
+
+    Актуальность проверяется по версии ресурса из api.cache: любая
+    запись в модель увеличивает версию, и снимок перечитывается одним
+    запросом. Между процессами версия общая только с общим бэкендом
+    кэша (Redis, Memcached, база); с locmem записи другого процесса
+    видны не позже чем через DIMENSION_CACHE_TIMEOUT секунд. Слаг или
+    id, которого нет в снимке, проверяется в базе, и если он там есть,
+    снимок перечитывается сразу.
+    """
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self._lock = Lock()
+        self._version = None
+        self._expires = 0.0
+        self._by_id = {}
+        self._by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # DRF копирует аргументы полей для каждого сериализатора,
+        # а кэш должен оставаться общим на процесс.
+        return self
+
+    def snapshot(self):
+        """Словари id -> строка и slug -> строка текущей версии."""
+        version, = cache.get_versions((self.resource,))
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    self._load(version)
+        return self._by_id, self._by_slug
+
+    def by_id(self, ids):
+        """Словарь id -> строка, в котором есть все ids, найденные в базе."""
+        return self._lookup('id', ids)[0]
+
+    def by_slug(self, slugs):
+        """Словарь slug -> строка, в котором есть все slugs из базы."""
+        return self._lookup('slug', slugs)[1]
+
+    def _lookup(self, field, keys):
+        by_id, by_slug = self.snapshot()
+        index = by_id if field == 'id' else by_slug
+        missing = [key for key in keys if key not in index]
+        if missing and self.model.objects.filter(
+            **{f'{field}__in': missing}
+        ).exists():
+            version, = cache.get_versions((self.resource,))
+            with self._lock:
+                self._load(version)
+            by_id, by_slug = self._by_id, self._by_slug
+        return by_id, by_slug
+
+    def _stale(self, version):
+        return version != self._version or monotonic() >= self._expires
+
+    def _load(self, version):
+        by_id, by_slug = {}, {}
+        for pk, slug, name in self.model.objects.order_by().values_list(
+            'id', 'slug', 'name'
+        ):
+            row = {'id': pk, 'name': name, 'slug': slug}
+            by_id[pk] = by_slug[slug] = row
+        self._by_id, self._by_slug = by_id, by_slug
+        self._version = version
+        self._expires = monotonic() + DIMENSION_CACHE_TIMEOUT
+
+    def resolve(self, slugs):
+        """Словарь slug -> экземпляр модели по снимку справочника."""
+        by_slug = self.by_slug(slugs)
+        fields = ('id', 'slug', 'name')
+        db = self.model.objects.db
+        return {
+            slug: self.model.from_db(
+                db, fields, [by_slug[slug][name] for name in fields]
+            )
+            for slug in slugs if slug in by_slug
+        }
+
+
+categories = DimensionCache(Category, cache.CATEGORIES)
+genres = DimensionCache(Genre, cache.GENRES)
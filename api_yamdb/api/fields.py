@@ -0,0 +1,115 @@
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    """
+    Список слагов, разрешаемый одним запросом `slug IN (...)`.
+
+    Стандартный ManyRelatedField делает по запросу на каждый слаг.
+    Здесь все неизвестные слаги перечисляются в одной ошибке, а
+    повторы в списке схлопываются с сохранением порядка.
+    """
+
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты со слагами: {slugs}.',
+        'invalid': 'Некорректное значение слага: {value}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        for value in data:
+            if not isinstance(value, str):
+                self.fail('invalid', value=value)
+        slugs = list(dict.fromkeys(data))
+        objects = self.resolve(slugs)
+        unknown = [slug for slug in slugs if slug not in objects]
+        if unknown:
+            self.fail('does_not_exist', slugs=', '.join(unknown))
+        return [objects[slug] for slug in slugs]
+
+    def resolve(self, slugs):
+        """Словарь слаг -> объект для найденных слагов."""
+        if self.child_relation.dimension is not None:
+            return self.child_relation.dimension.resolve(slugs)
+        slug_field = self.child_relation.slug_field
+        queryset = self.child_relation.get_queryset().filter(
+            **{f'{slug_field}__in': slugs}
+        )
+        return {getattr(obj, slug_field): obj for obj in queryset}
+
+
+class BatchedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который при many=True разрешает слаги пачкой.
+
+    С `dimension` (кэш справочника из api.dimensions) слаги
+    разрешаются по снимку в памяти без запросов к базе.
+    """
+
+    def __init__(self, dimension=None, **kwargs):
+        self.dimension = dimension
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if self.dimension is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        instance = self.dimension.resolve([data]).get(data)
+        if instance is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=data
+            )
+        return instance
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+
+class DimensionField(serializers.Field):
+    """
+    Категория или жанры произведения из кэша справочников.
+
+    Значение поля — id (или связи с id в `id_attr`); название и слаг
+    берутся из снимка api.dimensions без загрузки экземпляров моделей.
+    Снимок запрашивается один раз на корневой сериализатор и повторно,
+    только если в нём не нашлось id.
+    """
+
+    def __init__(self, dimension, id_attr=None, **kwargs):
+        kwargs['read_only'] = True
+        self.dimension = dimension
+        self.id_attr = id_attr
+        super().__init__(**kwargs)
+
+    def get_rows(self, ids):
+        key = f'dimension:{self.dimension.resource}'
+        rows = self.context.get(key)
+        if rows is None or any(pk not in rows for pk in ids):
+            rows = self.context[key] = self.dimension.by_id(ids)
+        return rows
+
+    def to_representation(self, value):
+        if self.id_attr is None:
+            ids = [] if value is None else [value]
+            return self.render(self.get_rows(ids).get(value))
+        ids = [getattr(link, self.id_attr) for link in value.all()]
+        rows = self.get_rows(ids)
+        found = [rows[pk] for pk in ids if pk in rows]
+        found.sort(key=lambda row: (row['name'], row['id']))
+        return [self.render(row) for row in found]
+
+    @staticmethod
+    def render(row):
+        if row is None:
+            return None
+        return {'name': row['name'], 'slug': row['slug']}
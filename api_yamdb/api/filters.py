@@ -1,13 +1,142 @@
-from django_filters import CharFilter, FilterSet
+from django_filters import CharFilter, ChoiceFilter, FilterSet, NumberFilter
+from rest_framework.filters import OrderingFilter, SearchFilter
 
-from reviews.models import Title
+from api import dimensions
+from reviews import search
+from reviews.models import Title, TitleGenre
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+MATCH_CHOICES = ((MATCH_ANY, 'Любой из жанров'), (MATCH_ALL, 'Все жанры'))
+
+
+def mirror(ordering):
+    """Обратный порядок: направление каждого поля меняется."""
+    return tuple(
+        name[1:] if name.startswith('-') else f'-{name}' for name in ordering
+    )
+
+
+def split_slugs(value):
+    """Слаги из значения вида `a,b,c` без пустых и повторов."""
+    return list(dict.fromkeys(
+        slug.strip() for slug in value.split(',') if slug.strip()
+    ))
+
+
+def filter_by_genres(queryset, genre_ids, match_all=False):
+    """
+    Отбор произведений по жанрам полусоединением `id IN (подзапрос)`.
+
+    В отличие от соединения с TitleGenre строки произведений не
+    размножаются, поэтому не нужны ни DISTINCT, ни группировка.
+    Коррелированный EXISTS SQLite выполняет просмотром всей таблицы
+    произведений, а некоррелированный IN идёт от индекса
+    (genre, title) к первичному ключу.
+    """
+    links = TitleGenre.objects.values('title_id')
+    if not match_all:
+        return queryset.filter(pk__in=links.filter(genre_id__in=genre_ids))
+    for genre_id in genre_ids:
+        queryset = queryset.filter(pk__in=links.filter(genre_id=genre_id))
+    return queryset
+
+
+class TitleSearchFilter(SearchFilter):
+    """
+    Поиск `?search=` по полнотекстовому индексу произведений.
+
+    Результаты ранжируются по релевантности; без индекса
+    используется стандартный поиск через LIKE.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if terms and search.is_enabled():
+            ranked = search.search_titles(queryset, ' '.join(terms))
+            if ranked is not None:
+                return ranked
+        return super().filter_queryset(request, queryset, view)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """
+    Сортировка произведений `?ordering=` по одному ключу.
+
+    Для каждого ключа задан полный порядок по убыванию с уникальным
+    хвостом; по возрастанию используется его зеркальное отражение.
+    Так оба направления читаются по индексу, а не сортируются целиком.
+    """
+
+    orderings = {
+        'rating': ('-rating', '-id'),
+        'reviews_count': ('-reviews_count', '-id'),
+        'year': ('-year', 'name', 'id'),
+    }
+
+    def get_valid_fields(self, queryset, view, context={}):
+        return [(name, name) for name in self.orderings]
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param, '').strip()
+        ordering = self.orderings.get(value.lstrip('-'))
+        if ordering is None:
+            return queryset
+        if not value.startswith('-'):
+            ordering = mirror(ordering)
+        return queryset.order_by(*ordering)
 
 
 class TitleFilters(FilterSet):
-    name = CharFilter(field_name='name', lookup_expr='icontains')
-    category = CharFilter(field_name='category__slug',)
-    genre = CharFilter(field_name='genre__slug',)
+    """
+    Фильтры произведений.
+
+    `category` и `genre` принимают один слаг или несколько через
+    запятую; слаги переводятся в id по кэшу справочников. Для жанров
+    `genre_match=all` требует все перечисленные жанры, по умолчанию
+    достаточно любого. Диапазоны по году и рейтингу идут по индексам
+    хранимых столбцов.
+    """
+
+    name = CharFilter(method='filter_name')
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    category = CharFilter(method='filter_category')
+    genre = CharFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=MATCH_CHOICES, method='filter_genre_match'
+    )
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = (
+            'name', 'year', 'year_min', 'year_max', 'rating_min',
+            'category', 'genre', 'genre_match'
+        )
+
+    def filter_category(self, queryset, name, value):
+        slugs = split_slugs(value)
+        by_slug = dimensions.categories.by_slug(slugs)
+        ids = [by_slug[slug]['id'] for slug in slugs if slug in by_slug]
+        return queryset.filter(category_id__in=ids)
+
+    def filter_genre(self, queryset, name, value):
+        slugs = split_slugs(value)
+        by_slug = dimensions.genres.by_slug(slugs)
+        ids = [by_slug[slug]['id'] for slug in slugs if slug in by_slug]
+        match_all = self.form.cleaned_data.get('genre_match') == MATCH_ALL
+        if not ids or (match_all and len(ids) < len(slugs)):
+            return queryset.none()
+        return filter_by_genres(queryset, ids, match_all)
+
+    def filter_genre_match(self, queryset, name, value):
+        """Режим учитывается в filter_genre."""
+        return queryset
+
+    def filter_name(self, queryset, name, value):
+        if search.is_enabled():
+            ranked = search.search_titles(queryset, value, columns=(name,))
+            if ranked is not None:
+                return ranked
+        return queryset.filter(**{f'{name}__icontains': value})
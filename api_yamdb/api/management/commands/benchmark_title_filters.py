@@ -0,0 +1,85 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Exists, OuterRef
+
+from api.filters import filter_by_genres
+from reviews.models import Genre, Title, TitleGenre
+
+# запуск: |python manage.py benchmark_title_filters drama,comedy --all|
+
+
+class Command(BaseCommand):
+    """Сравнение вариантов фильтра по жанрам: JOIN, EXISTS и IN."""
+
+    help = 'Замеряет время фильтра произведений по жанрам: JOIN, EXISTS, IN.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'genres', nargs='?', default='',
+            help='Слаги жанров через запятую; по умолчанию два самых частых.'
+        )
+        parser.add_argument('--all', action='store_true', dest='match_all')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--explain', action='store_true')
+
+    def handle(self, *args, **options):
+        slugs = [slug for slug in options['genres'].split(',') if slug]
+        genres = Genre.objects.annotate(
+            titles_count=Count('titles')
+        ).order_by('-titles_count', 'slug')
+        genres = list(genres.filter(slug__in=slugs) if slugs else genres[:2])
+        if not genres:
+            raise CommandError('Жанры не найдены.')
+        match_all = options['match_all']
+        queryset = Title.objects.order_by('-year', 'name')
+        genre_ids = [genre.id for genre in genres]
+        plans = {
+            'JOIN': self.join_queryset(queryset, genres, match_all),
+            'EXISTS': self.exists_queryset(queryset, genre_ids, match_all),
+            'IN': filter_by_genres(queryset, genre_ids, match_all),
+        }
+        self.stdout.write('Жанры: {slugs}, режим {mode}'.format(
+            slugs=', '.join(genre.slug for genre in genres),
+            mode='all' if match_all else 'any'
+        ))
+        for label, plan in plans.items():
+            elapsed, count = self.measure(
+                plan, options['page_size'], options['repeat']
+            )
+            self.stdout.write(f'{label}: {elapsed:.2f} мс ({count} шт.)')
+            if options['explain']:
+                self.stdout.write(plan.explain())
+
+    def join_queryset(self, queryset, genres, match_all):
+        """Прежний вариант: соединение через TitleGenre по слагам."""
+        if not match_all:
+            return queryset.filter(
+                genre__slug__in=[genre.slug for genre in genres]
+            ).distinct()
+        for genre in genres:
+            queryset = queryset.filter(genre__slug=genre.slug)
+        return queryset
+
+    def exists_queryset(self, queryset, genre_ids, match_all):
+        """Коррелированные подзапросы EXISTS по id жанров."""
+        links = TitleGenre.objects.filter(title_id=OuterRef('pk'))
+        if not match_all:
+            return queryset.filter(
+                Exists(links.filter(genre_id__in=genre_ids))
+            )
+        for genre_id in genre_ids:
+            queryset = queryset.filter(Exists(links.filter(genre_id=genre_id)))
+        return queryset
+
+    def measure(self, queryset, page_size, repeat):
+        """Медианное время подсчёта и выборки первой страницы, мс."""
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = perf_counter()
+            count = queryset.count()
+            list(queryset[:page_size])
+            timings.append((perf_counter() - started) * 1000)
+        return median(timings), count
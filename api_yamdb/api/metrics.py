@@ -0,0 +1,179 @@
+from bisect import bisect_left
+from threading import Lock
+
+# Верхние границы корзин гистограмм; последняя корзина — всё остальное.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576,
+)
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def quantile(counts, bounds, total, q):
+    """
+    Квантиль по гистограмме с линейной интерполяцией внутри корзины.
+
+    Для последней, открытой корзины возвращается её нижняя граница.
+    """
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = bounds[index - 1] if index else 0.0
+            if index == len(bounds):
+                return lower
+            return lower + (bounds[index] - lower) * (rank - seen) / count
+        seen += count
+    return bounds[-1]
+
+
+class EndpointMetrics:
+    """Счётчики одного действия: массивы фиксированной длины."""
+
+    __slots__ = (
+        'latency', 'latency_sum', 'sizes', 'size_sum', 'statuses', 'count'
+    )
+
+    def __init__(self):
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.statuses = [0] * len(STATUS_CLASSES)
+        self.count = 0
+
+    def observe(self, duration, status, size):
+        self.latency[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.latency_sum += duration
+        self.sizes[bisect_left(SIZE_BUCKETS, size)] += 1
+        self.size_sum += size
+        self.statuses[min(max(status // 100, 1), 5) - 1] += 1
+        self.count += 1
+
+    def copy(self):
+        copy = EndpointMetrics()
+        copy.latency = list(self.latency)
+        copy.latency_sum = self.latency_sum
+        copy.sizes = list(self.sizes)
+        copy.size_sum = self.size_sum
+        copy.statuses = list(self.statuses)
+        copy.count = self.count
+        return copy
+
+    def summary(self):
+        """Квантили задержки в мс, коды ответов и размеры ответов."""
+        latency = {
+            f'p{round(q * 100)}': quantile(
+                self.latency, LATENCY_BUCKETS, self.count, q
+            )
+            for q in QUANTILES
+        }
+        return {
+            'count': self.count,
+            'latency_ms': {
+                name: None if value is None else round(value * 1000, 2)
+                for name, value in latency.items()
+            },
+            'mean_ms': round(self.latency_sum / self.count * 1000, 2),
+            'status': dict(zip(STATUS_CLASSES, self.statuses)),
+            'mean_bytes': round(self.size_sum / self.count),
+        }
+
+
+class Registry:
+    """
+    Метрики запросов в памяти процесса по действиям вьюсетов.
+
+    Метка — `ИмяВьюсета.действие` (или имя view-функции). Память под
+    действие выделяется при его первом запросе, дальше запись только
+    увеличивает счётчики в готовых массивах.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = Lock()
+
+    def observe(self, label, duration, status, size):
+        with self._lock:
+            metrics = self._endpoints.get(label)
+            if metrics is None:
+                metrics = self._endpoints[label] = EndpointMetrics()
+            metrics.observe(duration, status, size)
+
+    def snapshot(self):
+        """Копии счётчиков по меткам, отсортированные по метке."""
+        with self._lock:
+            return [
+                (label, self._endpoints[label].copy())
+                for label in sorted(self._endpoints)
+            ]
+
+    def summary(self):
+        return {label: metrics.summary() for label, metrics in self.snapshot()}
+
+    def prometheus(self):
+        """Метрики в текстовом формате Prometheus."""
+        lines = []
+        snapshot = self.snapshot()
+        for name, help_text, bounds, counts, total in (
+            ('api_request_duration_seconds', 'Время ответа.',
+             LATENCY_BUCKETS, 'latency', 'latency_sum'),
+            ('api_response_size_bytes', 'Размер тела ответа.',
+             SIZE_BUCKETS, 'sizes', 'size_sum'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for label, metrics in snapshot:
+                cumulative = 0
+                buckets = getattr(metrics, counts)
+                for bound, count in zip(bounds + ('+Inf',), buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{endpoint="{label}",le="{bound}"}} '
+                        f'{cumulative}'
+                    )
+                lines.append(
+                    f'{name}_sum{{endpoint="{label}"}} '
+                    f'{getattr(metrics, total)}'
+                )
+                lines.append(
+                    f'{name}_count{{endpoint="{label}"}} {metrics.count}'
+                )
+        lines += [
+            '# HELP api_responses_total Ответы по классам кодов.',
+            '# TYPE api_responses_total counter',
+        ]
+        for label, metrics in snapshot:
+            for status, count in zip(STATUS_CLASSES, metrics.statuses):
+                lines.append(
+                    f'api_responses_total{{endpoint="{label}",'
+                    f'status="{status}"}} {count}'
+                )
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def view_label(view_func, method):
+    """
+    Метка действия DRF или None для прочих view.
+
+    Для вьюсетов — `ИмяВьюсета.действие`, для @api_view — имя функции.
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return None
+    actions = getattr(view_func, 'actions', None)
+    if actions is None:
+        return view_func.__name__
+    return f'{cls.__name__}.{actions.get(method.lower(), method.lower())}'
+
+
+registry = Registry()
@@ -0,0 +1,143 @@
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from api import metrics, timing
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = 'X-DB-Query-Count'
+QUERY_TIME_HEADER = 'X-DB-Time-Ms'
+SERVER_TIMING_HEADER = 'Server-Timing'
+
+
+class QueryCounter:
+    """Обёртка выполнения SQL: считает запросы и их суммарное время."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+
+
+class QueryCountMiddleware:
+    """
+    Число SQL-запросов и время в базе за запрос.
+
+    При включённой настройке QUERY_COUNT_HEADERS добавляет к ответу
+    заголовки X-DB-Query-Count и X-DB-Time-Ms и пишет их в лог. Работает
+    и без DEBUG: запросы считаются через execute_wrapper всех баз.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_COUNT_HEADERS:
+            return self.get_response(request)
+        counter = QueryCounter()
+        wrapped = []
+        try:
+            for connection in connections.all():
+                connection.execute_wrappers.append(counter)
+                wrapped.append(connection)
+            response = self.get_response(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(counter)
+        milliseconds = counter.duration * 1000
+        response[QUERY_COUNT_HEADER] = str(counter.count)
+        response[QUERY_TIME_HEADER] = f'{milliseconds:.2f}'
+        logger.info(
+            '%s %s: %d SQL-запросов, %.2f мс',
+            request.method, request.get_full_path(),
+            counter.count, milliseconds
+        )
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Заголовок Server-Timing с разбивкой времени запроса по этапам.
+
+    При включённой настройке SERVER_TIMING собирает время SQL (db),
+    `.data` сериализаторов (serialize), JSON-рендеринга (render) и
+    проверок прав (permissions), а также полное время (total), и пишет
+    их в лог полем `timings`. Этапы могут перекрываться: запрос к базе
+    изнутри сериализатора попадает и в db, и в serialize.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SERVER_TIMING:
+            return self.get_response(request)
+        token = timing.start()
+        timings = timing.current()
+        wrapped = []
+        try:
+            with timing.span(timing.TOTAL):
+                for connection in connections.all():
+                    connection.execute_wrappers.append(timing.query_timer)
+                    wrapped.append(connection)
+                response = self.get_response(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(timing.query_timer)
+            timing.stop(token)
+        response[SERVER_TIMING_HEADER] = timings.header()
+        logger.info(
+            '%s %s: %s', request.method, request.get_full_path(),
+            timings.header(),
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'timings': timings.milliseconds(),
+            }
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Время, код и размер ответа по действиям DRF в api.metrics.registry.
+
+    Метка действия определяется в process_view; запросы не к DRF
+    (админка, статика) не учитываются. Выключается настройкой
+    API_METRICS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.API_METRICS:
+            return self.get_response(request)
+        started = perf_counter()
+        response = self.get_response(request)
+        label = getattr(request, 'metrics_label', None)
+        if label is not None:
+            metrics.registry.observe(
+                label,
+                perf_counter() - started,
+                response.status_code,
+                0 if response.streaming else len(response.content),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.API_METRICS:
+            request.metrics_label = metrics.view_label(
+                view_func, request.method
+            )
@@ -0,0 +1,48 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+
+class NestedParentMixin:
+    """
+    Родительский объект вложенного ресурса из аргументов URL.
+
+    Дочерние объекты отбираются прямо по id родителя из URL, без
+    загрузки родителя. Сам родитель загружается не больше одного раза
+    за запрос и только там, где он нужен (создание). Существование
+    родителя для списка проверяется, лишь когда страница пуста.
+
+    parent_model — модель родителя; parent_lookup — поле родителя ->
+    аргумент URL; child_lookup — поле дочерней модели -> аргумент URL.
+    """
+
+    parent_model = None
+    parent_lookup = {}
+    child_lookup = {}
+
+    def get_parent(self):
+        """Родитель из URL; 404, если его нет."""
+        if getattr(self, '_parent', None) is None:
+            self._parent = get_object_or_404(
+                self.parent_model, **self._lookup(self.parent_lookup)
+            )
+            self._parent_exists = True
+        return self._parent
+
+    def parent_exists(self):
+        if getattr(self, '_parent_exists', None) is None:
+            self._parent_exists = self.parent_model.objects.filter(
+                **self._lookup(self.parent_lookup)
+            ).exists()
+        return self._parent_exists
+
+    def _lookup(self, mapping):
+        return {field: self.kwargs[kwarg] for field, kwarg in mapping.items()}
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**self._lookup(self.child_lookup))
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page and not self.parent_exists():
+            raise Http404
+        return page
@@ -1,9 +1,364 @@
-from rest_framework.pagination import PageNumberPagination
+from hashlib import md5
 
-from api_yamdb.constants import MAX_PAGE_SIZE, PAGE_SIZE
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import (EmptyResultSet, FieldDoesNotExist,
+                                    ValidationError)
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api_yamdb.constants import COUNT_CACHE_TIMEOUT, MAX_PAGE_SIZE, PAGE_SIZE
 
 
 class StandardPagination(PageNumberPagination):
     page_size = PAGE_SIZE
     page_size_query_param = 'page_size'
     max_page_size = MAX_PAGE_SIZE
+
+
+class NoCountPagination(StandardPagination):
+    """
+    Постраничный вывод без COUNT(*).
+
+    Запрашивается на одну строку больше размера страницы: по ней
+    определяется наличие следующей страницы. Ключа `count` в ответе нет.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.number = int(
+                request.query_params.get(self.page_query_param, 1)
+            )
+        except ValueError:
+            self.number = 0
+        if self.number < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Номер страницы должен быть положительным числом.'
+            ))
+        offset = (self.number - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page_results = results[:page_size]
+        if not self.page_results and self.number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.number, message='Страница пуста.'
+            ))
+        return self.page_results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'].pop('count')
+        response_schema['required'].remove('count')
+        return response_schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.page_query_param, self.number + 1
+        )
+
+    def get_previous_link(self):
+        if self.number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.number - 1
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator, кэширующий COUNT(*) по сигнатуре фильтров запроса.
+
+    Значение может отставать от данных не больше чем на
+    COUNT_CACHE_TIMEOUT секунд.
+    """
+
+    cache_prefix = 'pagination:count'
+
+    @cached_property
+    def count(self):
+        try:
+            signature = str(self.object_list.order_by().query)
+        except (AttributeError, EmptyResultSet):
+            return super().count
+        key = '{prefix}:{model}:{digest}'.format(
+            prefix=self.cache_prefix,
+            model=self.object_list.model._meta.label_lower,
+            digest=md5(signature.encode()).hexdigest(),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class CachedCountPagination(StandardPagination):
+    """Постраничный вывод с приближённым (кэшированным) `count`."""
+
+    django_paginator_class = CachedCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу сортировки (keyset) с подписанным курсором.
+
+    Вместо OFFSET страница выбирается условием «после последней строки»
+    по полям сортировки, поэтому время ответа не зависит от глубины
+    листания. Сортировка берётся из queryset, если она задана именами
+    полей и заканчивается уникальным полем (так её задаёт
+    TitleOrderingFilter), иначе — из `ordering`. NULL считается меньше
+    любого значения, как в SQLite.
+    """
+
+    ordering = ('id',)
+    page_size = PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    signing_salt = 'api.pagination.keyset'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_base_ordering(queryset)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+        position, self.reverse = self.decode_cursor(request)
+        ordering = self.get_ordering(self.reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, position)
+            )
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {
+                    'type': 'string', 'nullable': True, 'format': 'uri'
+                },
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_base_ordering(self, queryset):
+        """Сортировка queryset с уникальным последним полем или `ordering`."""
+        ordering = queryset.query.order_by
+        if not ordering or not all(
+            isinstance(name, str) for name in ordering
+        ):
+            return tuple(self.ordering)
+        try:
+            fields = [
+                queryset.model._meta.get_field(name.lstrip('-'))
+                for name in ordering
+            ]
+        except FieldDoesNotExist:
+            return tuple(self.ordering)
+        return tuple(ordering) if fields[-1].unique else tuple(self.ordering)
+
+    def get_ordering(self, reverse=False):
+        """Порядок сортировки; при листании назад направления меняются."""
+        if not reverse:
+            return tuple(self.ordering)
+        return tuple(
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        )
+
+    def get_keyset_filter(self, ordering, position):
+        """Условие «строго после position» для составного ключа."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, position):
+            field_name = name.lstrip('-')
+            if value is None:
+                # NULL меньше всех: после него по возрастанию идут
+                # все значения, по убыванию — ничего.
+                after = (
+                    Q(pk__in=[]) if name.startswith('-')
+                    else Q(**{f'{field_name}__isnull': False})
+                )
+                same = Q(**{f'{field_name}__isnull': True})
+            elif name.startswith('-'):
+                after = (
+                    Q(**{f'{field_name}__lt': value})
+                    | Q(**{f'{field_name}__isnull': True})
+                )
+                same = Q(**{field_name: value})
+            else:
+                after = Q(**{f'{field_name}__gt': value})
+                same = Q(**{field_name: value})
+            condition |= equal & after
+            equal &= same
+        return condition
+
+    def encode_cursor(self, instance, reverse):
+        position = [
+            None if field.value_from_object(instance) is None
+            else field.value_to_string(instance)
+            for field in self.fields
+        ]
+        token = signing.dumps(
+            {'p': position, 'r': reverse, 'o': self.ordering},
+            salt=self.signing_salt
+        )
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = signing.loads(token, salt=self.signing_salt)
+            if tuple(data['o']) != self.ordering:
+                raise ValueError('Курсор выдан для другой сортировки.')
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, data['p'], strict=True)
+            ]
+            return position, bool(data['r'])
+        except (signing.BadSignature, ValidationError, KeyError, TypeError,
+                ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class TitleKeysetPagination(KeysetPagination):
+    """
+    Keyset-пагинация произведений.
+
+    По умолчанию порядок (-year, name, id); с `?ordering=` — порядок,
+    выбранный TitleOrderingFilter.
+    """
+
+    ordering = ('-year', 'name', 'id')
+
+
+class PubDateKeysetPagination(KeysetPagination):
+    """Keyset-пагинация отзывов и комментариев в порядке (pub_date, id)."""
+
+    ordering = ('pub_date', 'id')
+
+
+class PaginationModeMixin:
+    """
+    Переключает режим пагинации по запросу клиента.
+
+    `pagination_modes` сопоставляет значения параметра `?pagination=`
+    с классами пагинации; наличие курсора включает режим `cursor`.
+    Без параметра остаётся постраничный вывод по номерам с точным
+    `count`.
+    """
+
+    pagination_modes = {}
+    mode_query_param = 'pagination'
+    keyset_mode = 'cursor'
+
+    def get_mode_class(self, request):
+        params = request.query_params
+        if KeysetPagination.cursor_query_param in params:
+            return self.pagination_modes.get(self.keyset_mode)
+        return self.pagination_modes.get(params.get(self.mode_query_param))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.mode = None
+        mode_class = self.get_mode_class(request)
+        if mode_class is not None:
+            self.mode = mode_class()
+            return self.mode.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode is not None:
+            return self.mode.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(PaginationModeMixin, StandardPagination):
+    """
+    Пагинация произведений.
+
+    Кроме номеров страниц доступны `?pagination=cursor` (keyset),
+    `?pagination=nocount` (без COUNT(*)) и `?pagination=cached-count`
+    (`count` из кэша по сигнатуре фильтров).
+    """
+
+    pagination_modes = {
+        'cursor': TitleKeysetPagination,
+        'nocount': NoCountPagination,
+        'cached-count': CachedCountPagination,
+    }
+
+
+class PubDatePagination(PaginationModeMixin, StandardPagination):
+    """Пагинация отзывов и комментариев: номера страниц или курсор."""
+
+    pagination_modes = {'cursor': PubDateKeysetPagination}
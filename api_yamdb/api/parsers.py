@@ -0,0 +1,24 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Разбор потока NDJSON: один JSON-объект на строку."""
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for number, line in enumerate(stream, 1):
+            try:
+                line = line.decode(encoding).strip()
+                if line:
+                    items.append(json.loads(line))
+            except ValueError as error:
+                raise ParseError(f'Строка {number}: {error}')
+        return items
@@ -33,7 +33,7 @@ class IsAuthorAdminModeratorOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
         return request.method in SAFE_METHODS or (
-            obj.author == user
+            obj.author_id == user.pk
             or user.is_admin()
             or user.is_moderator
         )
@@ -1,12 +1,19 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
+from api import dimensions
+from api.fields import BatchedSlugRelatedField, DimensionField
+from api.timing import TimedListSerializer, TimedSerializerMixin
 from api_yamdb.constants import (CONFIRMATION_CODE_MAX_LENGTH,
                                  EMAIL_MAX_LENGTH, RATING_MAX_VALUE,
                                  RATING_MIN_VALUE, REGULAR_USERNAME, ROLE_USER,
-                                 USERNAME_MAX_LENGTH)
+                                 TITLE_NAME_MAX_LENGH, USERNAME_MAX_LENGTH)
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.validators import validate_year_not_future
 
 
 class UserSignUpSerializer(serializers.ModelSerializer):
@@ -30,35 +37,39 @@ class UserSignUpSerializer(serializers.ModelSerializer):
         model = User
         fields = ('username', 'email')
 
-    def create(self, validated_data):
-        user, _ = User.objects.get_or_create(**validated_data)
-        return user
-
     def validate(self, attrs):
-        username = attrs.get('username')
-        email = attrs.get('email')
         User(**attrs).clean()
-        user_by_username = User.objects.filter(username=username).first()
-        user_by_email = User.objects.filter(email=email).first()
-        if (user_by_email and user_by_email.username != username) and (
-            user_by_username and user_by_username.email != email
-        ):
-            raise serializers.ValidationError({
-                'username': 'username занят другим пользователем',
-                'email': 'email занят другим пользователем'
-            })
-        if user_by_username and user_by_username.email != email:
-            raise serializers.ValidationError({
-                'username': 'username занят другим пользователем'
-            })
-        if user_by_email and user_by_email.username != username:
-            raise serializers.ValidationError({
-                'email': 'email занят другим пользователем'
-            })
         return attrs
 
-
-class AdminUserSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        """
+        Создаёт пользователя или возвращает уже зарегистрированного.
+
+        Сначала выполняется вставка: уникальность username и email
+        проверяет база. Только при конфликте одним запросом выясняется,
+        тот же это пользователь или данные заняты другим.
+        """
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            username = validated_data['username']
+            email = validated_data['email']
+            users = list(User.objects.filter(
+                Q(username=username) | Q(email=email)
+            ))
+        errors = {}
+        for user in users:
+            if user.username == username and user.email == email:
+                return user
+            if user.username == username:
+                errors['username'] = 'username занят другим пользователем'
+            if user.email == email:
+                errors['email'] = 'email занят другим пользователем'
+        raise serializers.ValidationError(errors)
+
+
+class AdminUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для администратора.
 
@@ -66,6 +77,7 @@ class AdminUserSerializer(serializers.ModelSerializer):
     """
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = User
         fields = (
             'username', 'email', 'first_name', 'last_name', 'bio', 'role'
@@ -97,47 +109,63 @@ class TokenSerializer(serializers.Serializer):
         return data
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         exclude = ('id',)
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Genre
         exclude = ('id',)
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для произведений."""
 
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(many=True, read_only=True)
+    category = DimensionField(dimensions.categories, source='category_id')
+    genre = DimensionField(
+        dimensions.genres, id_attr='genre_id', source='titlegenre_set'
+    )
     rating = serializers.IntegerField(read_only=True, default=None)
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Title
         fields = [
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
         ]
 
 
+class RatingStatsSerializer(serializers.Serializer):
+    """Сериализатор распределения оценок произведения."""
+
+    count = serializers.IntegerField()
+    mean = serializers.FloatField(allow_null=True)
+    median = serializers.FloatField(allow_null=True)
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+
 class TitleCRUDSerializer(serializers.ModelSerializer):
     """Сериализатор для создания, обновления, обработки данных."""
 
-    genre = serializers.SlugRelatedField(
+    genre = BatchedSlugRelatedField(
+        dimension=dimensions.genres,
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True,
         required=True,
         allow_empty=False
     )
-    category = serializers.SlugRelatedField(
+    category = BatchedSlugRelatedField(
+        dimension=dimensions.categories,
         slug_field='slug',
         queryset=Category.objects.all(),
         required=True
@@ -152,42 +180,66 @@ class TitleCRUDSerializer(serializers.ModelSerializer):
         return TitleSerializer(instance, context=self.context).data
 
 
-class ReviewsSerializer(serializers.ModelSerializer):
-    """Сериализатор для отзывов на произведения."""
+class TitleBulkItemSerializer(serializers.Serializer):
+    """
+    Элемент массовой загрузки произведений.
 
-    author = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='username',
-        default=serializers.CurrentUserDefault()
+    Слаги жанров и категории не проверяются по базе: их разом
+    разрешает api.bulk.bulk_save_titles.
+    """
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    name = serializers.CharField(max_length=TITLE_NAME_MAX_LENGH)
+    year = serializers.IntegerField(validators=[validate_year_not_future])
+    description = serializers.CharField(required=False, allow_blank=True)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
     )
+    category = serializers.SlugField()
+
+
+class ReviewsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Сериализатор для отзывов на произведения."""
+
+    author = serializers.ReadOnlyField(source='author.username')
     score = serializers.IntegerField(
         min_value=RATING_MIN_VALUE, max_value=RATING_MAX_VALUE
     )
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Review
         fields = ('id', 'text', 'score', 'author', 'pub_date')
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method == 'POST':
-            if Review.objects.filter(
-                author=request.user,
-                title_id=self.context['view'].kwargs.get('title_id')
+    def create(self, validated_data):
+        """
+        Создаёт отзыв без предварительной проверки на повтор.
+
+        Второй отзыв автора на произведение отсекает ограничение
+        unique_review, и его нарушение превращается в ошибку валидации.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author_id=validated_data['author_id'],
+                title=validated_data['title']
             ).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставляли отзыв на это произведение.'
-                )
-        return data
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставляли отзыв на это произведение.'
+            ]
+        })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для комментариев к отзывам на произведения."""
 
-    author = serializers.SlugRelatedField(
-        read_only=True, slug_field='username'
-    )
+    author = serializers.ReadOnlyField(source='author.username')
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
@@ -0,0 +1,85 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api import autocomplete, cache
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+from reviews.signals import data_rebuilt, titles_bulk_saved
+
+AUTOCOMPLETE_KINDS = {
+    Title: autocomplete.TITLES,
+    Genre: autocomplete.GENRES,
+    Category: autocomplete.CATEGORIES,
+}
+
+
+CACHE_RESOURCES = {
+    Title: cache.TITLES,
+    TitleGenre: cache.TITLES,
+    Review: cache.TITLES,
+    Category: cache.CATEGORIES,
+    Genre: cache.GENRES,
+}
+
+
+def reset_autocomplete(sender, **kwargs):
+    """Сбрасывает индекс автодополнения после migrate и flush."""
+    autocomplete.index.reset()
+
+
+def reset_response_cache(sender, **kwargs):
+    """Инвалидирует кэш ответов после migrate и flush."""
+    cache.bump_version(*cache.RESOURCES)
+
+
+@receiver(data_rebuilt)
+def data_rebuilt_handler(sender, **kwargs):
+    """Сбрасывает кэш ответов и подсказки после записи в обход сигналов."""
+    cache.bump_version(*cache.RESOURCES)
+    autocomplete.index.reset()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def response_cache_changed(sender, **kwargs):
+    """Увеличивает версию ресурса при любой записи его модели."""
+    resource = CACHE_RESOURCES.get(sender)
+    if resource is not None:
+        cache.bump_version(resource)
+
+
+@receiver(titles_bulk_saved)
+def titles_bulk_saved_handler(sender, created, updated, **kwargs):
+    """Учитывает массово сохранённые произведения в кэше и подсказках."""
+    cache.bump_version(cache.TITLES)
+    autocomplete.index.update_many(autocomplete.TITLES, [
+        (title.pk, title.name, autocomplete.title_payload(title))
+        for title in created + updated
+    ])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        cache.bump_version(cache.TITLES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def autocomplete_saved(sender, instance, **kwargs):
+    """Обновляет название в индексе автодополнения."""
+    payload = (
+        autocomplete.title_payload(instance) if sender is Title
+        else autocomplete.dimension_payload(instance)
+    )
+    autocomplete.index.update(
+        AUTOCOMPLETE_KINDS[sender], instance.pk, instance.name, payload
+    )
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def autocomplete_deleted(sender, instance, **kwargs):
+    """Удаляет название из индекса автодополнения."""
+    autocomplete.index.remove(AUTOCOMPLETE_KINDS[sender], instance.pk)
@@ -0,0 +1,142 @@
+from contextvars import ContextVar
+from time import perf_counter
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
+
+DB = 'db'
+SERIALIZE = 'serialize'
+RENDER = 'render'
+PERMISSIONS = 'permissions'
+TOTAL = 'total'
+
+_current = ContextVar('api_timings', default=None)
+
+
+class Timings:
+    """Суммарное время этапов одного запроса, секунды."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def milliseconds(self):
+        return {
+            name: round(duration * 1000, 2)
+            for name, duration in self.durations.items()
+        }
+
+    def header(self):
+        """Значение заголовка Server-Timing."""
+        return ', '.join(
+            f'{name};dur={duration}'
+            for name, duration in self.milliseconds().items()
+        )
+
+
+def start():
+    """Включает замеры для текущего запроса; возвращает токен для stop()."""
+    return _current.set(Timings())
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    """Замеры текущего запроса или None, если они выключены."""
+    return _current.get()
+
+
+class Span:
+
+    __slots__ = ('timings', 'name', 'started')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, perf_counter() - self.started)
+
+
+class NullSpan:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name):
+    """
+    Контекстный менеджер, добавляющий своё время к этапу `name`.
+
+    При выключенных замерах возвращает общий пустой менеджер: цена
+    вызова — одно чтение ContextVar.
+    """
+    timings = _current.get()
+    if timings is None:
+        return NULL_SPAN
+    return Span(timings, name)
+
+
+def query_timer(execute, sql, params, many, context):
+    """Обёртка выполнения SQL для connection.execute_wrapper()."""
+    with span(DB):
+        return execute(sql, params, many, context)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON-рендерер, время которого попадает в этап render."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with span(RENDER):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedListSerializer(ListSerializer):
+    """Сериализация списка целиком учитывается в этапе serialize."""
+
+    @property
+    def data(self):
+        with span(SERIALIZE):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Учитывает `.data` сериализатора в этапе serialize.
+
+    Для списков в Meta сериализатора указывается
+    `list_serializer_class = TimedListSerializer`.
+    """
+
+    @property
+    def data(self):
+        with span(SERIALIZE):
+            return super().data
+
+
+class TimedPermissionsMixin:
+    """Учитывает проверки прав вьюсета в этапе permissions."""
+
+    def check_permissions(self, request):
+        with span(PERMISSIONS):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with span(PERMISSIONS):
+            super().check_object_permissions(request, obj)
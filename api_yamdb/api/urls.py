@@ -2,8 +2,9 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewsViewSet, TitleViewSet, UserViewSet, get_token,
-                       signup)
+                       ReviewsViewSet, TitleViewSet, UserViewSet,
+                       autocomplete_view, get_token, prometheus_view,
+                       signup, stats_view)
 from api_yamdb.constants import VERSION
 
 router_v1 = DefaultRouter()
@@ -22,6 +23,14 @@ router_v1.register(
 urlpatterns = [
     path(f'{VERSION}/auth/signup/', signup, name='signup'),
     path(f'{VERSION}/auth/token/', get_token, name='token'),
+    path(
+        f'{VERSION}/autocomplete/', autocomplete_view, name='autocomplete'
+    ),
+    path(f'{VERSION}/_stats/', stats_view, name='stats'),
+    path(
+        f'{VERSION}/_stats/prometheus/', prometheus_view,
+        name='stats-prometheus'
+    ),
     path(
         f'{VERSION}/',
         include(router_v1.urls),
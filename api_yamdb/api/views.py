@@ -1,30 +1,49 @@
-from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Max, Prefetch
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import (SAFE_METHODS, AllowAny,
                                         IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import TitleFilters
-from api.pagination import StandardPagination
+from api import autocomplete, bulk, cache, metrics
+from api.cache import CachedListMixin, CachedRetrieveMixin
+from api.conditional import (ConditionalListMixin, ConditionalRetrieveMixin,
+                             make_etag)
+from api.filters import (TitleFilters, TitleOrderingFilter,
+                         TitleSearchFilter)
+from api.nested import NestedParentMixin
+from api.pagination import (PubDatePagination, StandardPagination,
+                            TitlePagination)
+from api.parsers import NDJSONParser
 from api.permissions import (IsAdmin, IsAdminOrReadOnly,
                              IsAuthorAdminModeratorOrReadOnly)
 from api.serializers import (AdminUserSerializer, CategorySerializer,
                              CommentSerializer, GenreSerializer,
-                             ReviewsSerializer, TitleCRUDSerializer,
+                             RatingStatsSerializer, ReviewsSerializer,
+                             TitleBulkItemSerializer, TitleCRUDSerializer,
                              TitleSerializer, TokenSerializer,
                              UserSignUpSerializer)
-from api_yamdb.constants import MY_USER_PROFILE, ROLE_USER
-from reviews.models import Category, Genre, Review, Title, User
+from api.timing import TimedPermissionsMixin
+from api_yamdb.constants import (AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_LIMIT,
+                                 BULK_TITLES_MAX_ITEMS, MY_USER_PROFILE,
+                                 ROLE_USER)
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, TitleScoreStats, User)
+from users import cache as user_cache
+from users import outbox
+from users.cache import accounts_changed_at
+from users.tokens import access_token_for
 
 
 class CreateListDestroyViewSet(
+    TimedPermissionsMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -36,11 +55,12 @@ class CreateListDestroyViewSet(
     filter_backends = (filters.SearchFilter,)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(TimedPermissionsMixin, viewsets.ModelViewSet):
     """Класс отвечает за управление пользователями и аутентификацией."""
 
     queryset = User.objects.all().order_by('id', 'username')
     serializer_class = AdminUserSerializer
+    pagination_class = StandardPagination
     permission_classes = [IsAdmin]
     lookup_field = 'username'
     filter_backends = (filters.SearchFilter,)
@@ -56,7 +76,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def me(self, request):
         """Просмотр и редактирование своего профиля."""
 
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             return Response(AdminUserSerializer(user).data)
         data = request.data.copy()
@@ -76,14 +96,16 @@ def signup(request):
     """Регистрация пользователя и кода."""
     serializer = UserSignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user = serializer.save()
-    confirmation_code = user.generate_confirmation_code()
-    send_mail(
-        subject='Yamdb confirmation code',
-        message=f'Ваш код подтверждения: {confirmation_code}',
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email]
-    )
+    with transaction.atomic():
+        user = serializer.save()
+        outbox.enqueue(
+            subject='Yamdb confirmation code',
+            message=(
+                'Ваш код подтверждения: '
+                f'{user.generate_confirmation_code()}'
+            ),
+            recipient_list=[user.email]
+        )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -94,14 +116,52 @@ def get_token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     return Response(
-        {'token': str(AccessToken.for_user(
-            serializer.context.get(ROLE_USER)
-        ))},
+        {'token': str(access_token_for(serializer.context.get(ROLE_USER)))},
         status=status.HTTP_200_OK
     )
 
 
-class CategoryGenreBaseViewSet(CreateListDestroyViewSet):
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_view(request):
+    """Подсказки по началу названий произведений, жанров и категорий."""
+    try:
+        limit = int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    limit = min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
+    return Response(
+        autocomplete.index.search(request.query_params.get('q', ''), limit)
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def stats_view(request):
+    """
+    Число запросов, p50/p95/p99 времени ответа и коды по действиям,
+    а также попадания в кэш ответов и в кэш пользователей процесса.
+    """
+    return Response({
+        'endpoints': metrics.registry.summary(),
+        'caches': {
+            'responses': cache.get_stats(),
+            'users': user_cache.accounts.stats(),
+        },
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def prometheus_view(request):
+    """Метрики действий API в текстовом формате Prometheus."""
+    return HttpResponse(
+        metrics.registry.prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+class CategoryGenreBaseViewSet(CachedListMixin, CreateListDestroyViewSet):
     """Базовый ViewSet для категорий и жанров."""
 
     permission_classes = (IsAdminOrReadOnly,)
@@ -114,6 +174,7 @@ class CategoryViewSet(CategoryGenreBaseViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_resources = (cache.CATEGORIES,)
 
 
 class GenreViewSet(CategoryGenreBaseViewSet):
@@ -121,23 +182,30 @@ class GenreViewSet(CategoryGenreBaseViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_resources = (cache.GENRES,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(TimedPermissionsMixin, ConditionalRetrieveMixin,
+                   CachedListMixin, CachedRetrieveMixin,
+                   viewsets.ModelViewSet):
     """Класс для управления произведениями."""
 
     queryset = (
         Title.objects
-        .annotate(rating=Avg('reviews__score'))
-        .select_related('category')
-        .prefetch_related('genre')
+        .prefetch_related(Prefetch(
+            'titlegenre_set',
+            queryset=TitleGenre.objects.only('title_id', 'genre_id')
+        ))
         .order_by('-year', 'name')
     )
-    pagination_class = StandardPagination
+    pagination_class = TitlePagination
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter, DjangoFilterBackend)
+    filter_backends = (
+        TitleSearchFilter, DjangoFilterBackend, TitleOrderingFilter
+    )
     search_fields = ('name', 'description')
     filterset_class = TitleFilters
+    cache_resources = (cache.TITLES, cache.CATEGORIES, cache.GENRES)
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
 
     def get_serializer_class(self):
@@ -147,44 +215,123 @@ class TitleViewSet(viewsets.ModelViewSet):
             else TitleCRUDSerializer
         )
 
+    def get_validators(self, request):
+        try:
+            updated_at = (
+                Title.objects.filter(pk=self.kwargs['pk'])
+                .values_list('updated_at', flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            # Нечисловой id: 404 вернёт get_object().
+            return None
+        if updated_at is None:
+            return None
+        versions = cache.get_versions((cache.CATEGORIES, cache.GENRES))
+        return make_etag(updated_at, versions), updated_at
+
+    @action(methods=['get'], detail=True, url_path='rating-stats')
+    def rating_stats(self, request, pk=None):
+        """Распределение, среднее и медиана оценок произведения."""
+        try:
+            stats = TitleScoreStats.objects.filter(title_id=pk).first()
+        except (TypeError, ValueError):
+            raise Http404
+        if stats is None:
+            stats = TitleScoreStats(title=get_object_or_404(Title, pk=pk))
+        return Response(RatingStatsSerializer(stats).data)
 
-class ReviewsViewSet(viewsets.ModelViewSet):
+    @action(
+        methods=['post'],
+        detail=False,
+        url_path='bulk',
+        permission_classes=[IsAdmin],
+        parser_classes=[JSONParser, NDJSONParser]
+    )
+    def bulk(self, request):
+        """Массовое создание и обновление произведений."""
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {'detail': 'Ожидается список произведений или NDJSON.'}
+            )
+        if len(request.data) > BULK_TITLES_MAX_ITEMS:
+            raise ValidationError({'detail': (
+                'Слишком много произведений в одном запросе: '
+                f'не больше {BULK_TITLES_MAX_ITEMS}.'
+            )})
+        items, errors = [], {}
+        for index, data in enumerate(request.data):
+            serializer = TitleBulkItemSerializer(data=data)
+            if serializer.is_valid():
+                items.append(serializer.validated_data)
+            else:
+                items.append(None)
+                errors[index] = serializer.errors
+        results = bulk.bulk_save_titles(items)
+        for index, item_errors in errors.items():
+            results[index] = {'status': bulk.ERROR, 'errors': item_errors}
+        return Response({'results': results})
+
+
+class ReviewsViewSet(TimedPermissionsMixin, NestedParentMixin,
+                     ConditionalListMixin, viewsets.ModelViewSet):
     """Класс для управления отзывов на произведения."""
 
+    queryset = Review.objects.select_related('author').order_by(
+        'pub_date', 'id'
+    )
     serializer_class = ReviewsSerializer
+    pagination_class = PubDatePagination
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAuthorAdminModeratorOrReadOnly
     )
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
-
-    def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs['title_id'])
-
-    def get_queryset(self):
-        return self.get_title().reviews.all().order_by('pub_date',)
+    parent_model = Title
+    parent_lookup = {'pk': 'title_id'}
+    child_lookup = {'title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(
+            author_id=self.request.user.pk, title=self.get_parent()
+        )
+
+    def get_validators(self, request):
+        validators = (
+            Title.objects.filter(pk=self.kwargs['title_id'])
+            .annotate(last_review=Max('reviews__updated_at'))
+            .values_list('updated_at', 'last_review')
+            .first()
+        )
+        self._parent_exists = validators is not None
+        if validators is None:
+            return None
+        # В ответе показаны имена авторов: их смена тоже меняет ответ.
+        validators += (accounts_changed_at(),)
+        params = sorted(request.query_params.lists())
+        return (
+            make_etag(*validators, params),
+            max(value for value in validators if value is not None)
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(TimedPermissionsMixin, NestedParentMixin,
+                     viewsets.ModelViewSet):
     """Класс для управления комментариев к отзывам."""
 
+    queryset = Comment.objects.select_related('author').order_by(
+        'pub_date', 'id'
+    )
     serializer_class = CommentSerializer
+    pagination_class = PubDatePagination
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAuthorAdminModeratorOrReadOnly
     )
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
-
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs['review_id'],
-            title__id=self.kwargs['title_id']
-        )
-
-    def get_queryset(self):
-        return self.get_review().comments.all().order_by('pub_date',)
+    parent_model = Review
+    parent_lookup = {'pk': 'review_id', 'title_id': 'title_id'}
+    child_lookup = {'reviews_id': 'review_id', 'reviews__title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, reviews=self.get_review())
+        serializer.save(
+            author_id=self.request.user.pk, reviews=self.get_parent()
+        )
@@ -19,6 +19,22 @@ REGULAR_USERNAME = r'^[\w.@+-]+\Z'
 
 PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
+COUNT_CACHE_TIMEOUT = 60
+RESPONSE_CACHE_TIMEOUT = 300
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_INDEX_TIMEOUT = 300
+DIMENSION_CACHE_TIMEOUT = 60
+BULK_TITLES_MAX_ITEMS = 5000
+TOKEN_VERSION_CACHE_TIMEOUT = 300
+USER_CACHE_MAX_SIZE = 1024
+USER_CACHE_TIMEOUT = 60
+MAIL_OUTBOX_BATCH_SIZE = 100
+MAIL_OUTBOX_MAX_ATTEMPTS = 5
+MAIL_OUTBOX_RETRY_DELAY = 60
+MAIL_OUTBOX_MAX_RETRY_DELAY = 3600
+MAIL_OUTBOX_POLL_INTERVAL = 5
+MAIL_OUTBOX_CLAIM_TIMEOUT = 300
 STR_LENGTH = 20
 CATEGORY_GENRE_MAX_LENGTH = 256
 TITLE_NAME_MAX_LENGH = 256
@@ -29,6 +29,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.ServerTimingMiddleware',
+    'api.middleware.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -102,11 +105,30 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',],
+        'api.authentication.StatelessJWTAuthentication',],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.timing.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    }
+}
+
+TITLE_FULLTEXT_SEARCH = True
+# Заголовки X-DB-Query-Count и X-DB-Time-Ms и лог запросов к базе.
+QUERY_COUNT_HEADERS = os.getenv('QUERY_COUNT_HEADERS', '') == 'True'
+# Заголовок Server-Timing и лог времени этапов запроса.
+SERVER_TIMING = os.getenv('SERVER_TIMING', '') == 'True'
+# Гистограммы времени ответа по действиям API (/api/v1/_stats/).
+API_METRICS = os.getenv('API_METRICS', 'True') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -115,6 +137,12 @@ SIMPLE_JWT = {
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 DEFAULT_FROM_EMAIL = 'no-reply@yamdb.ru'
+# thread — очередь outbox разбирает фоновый поток процесса: сразу после
+# коммита новых писем и раз в MAIL_OUTBOX_POLL_INTERVAL секунд для
+# повторов; worker — только команда send_mail_outbox --loop, которую
+# нужно запускать отдельно; eager — сам запрос после коммита (только
+# для тестов: так письмо сразу видно в mail.outbox).
+MAIL_OUTBOX_DELIVERY = os.getenv('MAIL_OUTBOX_DELIVERY', 'thread')
 
 
 EMAIL_HOST = None
@@ -1,7 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = 'Обзоры'
+
+    def ready(self):
+        from reviews.signals import ensure_search_index
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,389 @@
+import csv
+import os
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from itertools import accumulate, islice
+from random import Random
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from api_yamdb.constants import (RATING_MAX_VALUE, RATING_MIN_VALUE,
+                                 ROLE_MODERATOR, ROLE_USER)
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, User)
+
+WORDS = (
+    'фильм', 'книга', 'сюжет', 'герой', 'финал', 'музыка', 'актёр', 'автор',
+    'сцена', 'история', 'мир', 'время', 'любовь', 'война', 'дорога', 'город',
+    'тайна', 'ночь', 'море', 'звезда', 'отличный', 'скучный', 'сильный',
+    'странный', 'красивый', 'долгий', 'смешной', 'тёмный', 'новый', 'старый',
+)
+FIRST_YEAR = 1900
+LAST_YEAR = 2024
+MAX_GENRES_PER_TITLE = 3
+MODERATOR_SHARE = 0.01
+TEXT_POOL_SIZE = 10_000
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+PERIOD_SECONDS = 10 * 365 * 24 * 3600
+
+# Таблица -> (модель, файл CSV, колонки CSV как в import_csv, поля модели).
+TABLES = {
+    'users': (
+        User, 'users.csv',
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+    ),
+    'categories': (
+        Category, 'category.csv', ('id', 'name', 'slug'),
+        ('id', 'name', 'slug'),
+    ),
+    'genres': (
+        Genre, 'genre.csv', ('id', 'name', 'slug'), ('id', 'name', 'slug'),
+    ),
+    'titles': (
+        Title, 'titles.csv', ('id', 'name', 'year', 'category'),
+        ('id', 'name', 'year', 'category_id'),
+    ),
+    'title_genres': (
+        TitleGenre, 'genre_title.csv', ('id', 'title_id', 'genre_id'),
+        ('id', 'title_id', 'genre_id'),
+    ),
+    'reviews': (
+        Review, 'review.csv',
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment, 'comments.csv',
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'reviews_id', 'text', 'author_id', 'pub_date'),
+    ),
+}
+
+
+def zipf_cum_weights(size, exponent):
+    """Накопленные веса распределения Ципфа для рангов 1..size."""
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+def csv_date(value):
+    """Дата в формате static/data."""
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def database_date(value):
+    """Дата в формате хранения текущей базы."""
+    return connection.ops.adapt_datetimefield_value(value)
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class DatasetGenerator:
+    """
+    Детерминированный синтетический набор данных со скошенным спросом.
+
+    Популярность произведений, жанров и категорий и активность авторов
+    распределены по Ципфу с показателем `skew`; ранги перемешаны, так
+    что популярные объекты не идут первыми по id. Отзывы произведения
+    получают id подряд, пара (автор, произведение) уникальна. Строки
+    выдаются генераторами в порядке колонок TABLES.
+    """
+
+    def __init__(self, users, categories, genres, titles, reviews,
+                 comments, seed=0, skew=1.1, start_ids=None,
+                 format_date=None):
+        self.sizes = {
+            'users': users, 'categories': categories, 'genres': genres,
+            'titles': titles, 'reviews': reviews, 'comments': comments,
+        }
+        self.seed = seed
+        self.skew = skew
+        self.start_ids = {name: 0 for name in TABLES}
+        self.start_ids.update(start_ids or {})
+        self._texts = {}
+        self.format_date = format_date or csv_date
+
+    def random(self, table):
+        """Свой поток случайных чисел для каждой таблицы."""
+        return Random(f'{self.seed}:{table}')
+
+    def ranked_ids(self, table, size):
+        """id объектов в порядке убывания популярности."""
+        ids = list(range(
+            self.start_ids[table] + 1, self.start_ids[table] + size + 1
+        ))
+        self.random(f'{table}:ranks').shuffle(ids)
+        return ids
+
+    def picker(self, table, size):
+        """Функция выбора id объекта с вероятностью по Ципфу."""
+        ids = self.ranked_ids(table, size)
+        weights = zipf_cum_weights(size, self.skew)
+        total = weights[-1]
+
+        def pick(rng):
+            return ids[bisect_left(weights, rng.random() * total)]
+        return pick
+
+    def texts(self, shortest, longest):
+        """
+        Заранее собранные фразы из `shortest`..`longest` слов.
+
+        Выбор готовой фразы в разы дешевле сборки новой на каждую строку.
+        """
+        key = shortest, longest
+        if key not in self._texts:
+            rng = self.random(f'texts:{shortest}:{longest}')
+            self._texts[key] = [
+                ' '.join(
+                    rng.choices(WORDS, k=rng.randint(shortest, longest))
+                ).capitalize()
+                for _ in range(TEXT_POOL_SIZE)
+            ]
+        return self._texts[key]
+
+    @cached_property
+    def pub_dates(self):
+        """Случайные даты публикации, уже приведённые format_date."""
+        rng = self.random('pub_dates')
+        return [
+            self.format_date(
+                EPOCH + timedelta(seconds=rng.randrange(PERIOD_SECONDS))
+            )
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+    def users(self):
+        rng = self.random('users')
+        for user_id in range(
+            self.start_ids['users'] + 1,
+            self.start_ids['users'] + self.sizes['users'] + 1
+        ):
+            role = (
+                ROLE_MODERATOR if rng.random() < MODERATOR_SHARE
+                else ROLE_USER
+            )
+            yield (
+                user_id, f'reader{user_id}', f'reader{user_id}@yamdb.fake',
+                role, '', '', ''
+            )
+
+    def dimension(self, table, label):
+        start = self.start_ids[table]
+        for number in range(start + 1, start + self.sizes[table] + 1):
+            yield number, f'{label} {number}', f'{table[:-1]}-{number}'
+
+    def categories(self):
+        return self.dimension('categories', 'Категория')
+
+    def genres(self):
+        return self.dimension('genres', 'Жанр')
+
+    def titles(self):
+        rng = self.random('titles')
+        pick_category = self.picker('categories', self.sizes['categories'])
+        names = self.texts(1, 4)
+        for title_id in self.title_ids():
+            yield (
+                title_id, rng.choice(names),
+                rng.randint(FIRST_YEAR, LAST_YEAR), pick_category(rng)
+            )
+
+    def title_ids(self):
+        start = self.start_ids['titles']
+        return range(start + 1, start + self.sizes['titles'] + 1)
+
+    def title_genres(self):
+        rng = self.random('title_genres')
+        pick_genre = self.picker('genres', self.sizes['genres'])
+        limit = min(MAX_GENRES_PER_TITLE, self.sizes['genres'])
+        row_id = self.start_ids['title_genres']
+        for title_id in self.title_ids():
+            wanted = rng.randint(1, limit)
+            genres = set()
+            while len(genres) < wanted:
+                genres.add(pick_genre(rng))
+            for genre_id in sorted(genres):
+                row_id += 1
+                yield row_id, title_id, genre_id
+
+    @cached_property
+    def review_quotas(self):
+        """
+        Число отзывов каждого произведения по Ципфу.
+
+        Произведение не может получить больше отзывов, чем есть
+        пользователей; излишек достаётся следующим по популярности.
+        """
+        titles, users = self.sizes['titles'], self.sizes['users']
+        total = min(self.sizes['reviews'], titles * users)
+        ranked = self.ranked_ids('titles', titles)
+        weights = zipf_cum_weights(titles, self.skew)
+        quotas, previous, left = {}, 0.0, total
+        for title_id, weight in zip(ranked, weights):
+            quota = min(int(total * (weight - previous) / weights[-1]), users)
+            quotas[title_id] = quota
+            left -= quota
+            previous = weight
+        for title_id in ranked:
+            if not left:
+                break
+            extra = min(users - quotas[title_id], left)
+            quotas[title_id] += extra
+            left -= extra
+        return quotas
+
+    def review_authors(self, rng, pick_user, count):
+        """
+        `count` разных авторов, активные выбираются чаще.
+
+        Число выборок по Ципфу ограничено: редких авторов пришлось бы
+        ждать слишком долго, поэтому остаток добирается равномерно.
+        """
+        users, start = self.sizes['users'], self.start_ids['users']
+        if count * 2 > users:
+            return rng.sample(range(start + 1, start + users + 1), count)
+        authors = set()
+        for _ in range(count * 2):
+            authors.add(pick_user(rng))
+            if len(authors) == count:
+                break
+        while len(authors) < count:
+            authors.add(rng.randint(start + 1, start + users))
+        return sorted(authors)
+
+    def reviews(self):
+        rng = self.random('reviews')
+        pick_user = self.picker('users', self.sizes['users'])
+        quotas = self.review_quotas
+        texts = self.texts(3, 20)
+        row_id = self.start_ids['reviews']
+        for title_id in self.title_ids():
+            if not quotas[title_id]:
+                continue
+            # Средняя оценка своя у каждого произведения.
+            mean = rng.uniform(RATING_MIN_VALUE, RATING_MAX_VALUE)
+            for author_id in self.review_authors(
+                rng, pick_user, quotas[title_id]
+            ):
+                row_id += 1
+                score = min(max(round(rng.gauss(mean, 1.5)),
+                                RATING_MIN_VALUE), RATING_MAX_VALUE)
+                yield (
+                    row_id, title_id, rng.choice(texts),
+                    author_id, score, rng.choice(self.pub_dates)
+                )
+
+    def comments(self):
+        """Комментарии к отзывам популярных произведений чаще."""
+        if not self.sizes['comments']:
+            return
+        rng = self.random('comments')
+        pick_user = self.picker('users', self.sizes['users'])
+        quotas = self.review_quotas
+        first_ids, counts, next_id = [], [], self.start_ids['reviews'] + 1
+        for title_id in self.title_ids():
+            if quotas[title_id]:
+                first_ids.append(next_id)
+                counts.append(quotas[title_id])
+                next_id += quotas[title_id]
+        if not counts:
+            return
+        weights = list(accumulate(counts))
+        texts = self.texts(2, 12)
+        row_id = self.start_ids['comments']
+        for _ in range(self.sizes['comments']):
+            index = bisect_left(weights, rng.random() * weights[-1])
+            row_id += 1
+            yield (
+                row_id,
+                first_ids[index] + min(
+                    int(rng.paretovariate(self.skew)) - 1, counts[index] - 1
+                ),
+                rng.choice(texts),
+                pick_user(rng),
+                rng.choice(self.pub_dates),
+            )
+
+
+def database_start_ids():
+    """Наибольшие id таблиц: новые строки пишутся после них."""
+    return {
+        table: model.objects.aggregate(last=Max('id'))['last'] or 0
+        for table, (model, *_) in TABLES.items()
+    }
+
+
+def insert_statement(model, fields):
+    """
+    INSERT всех колонок модели и значения колонок, которых нет в наборе.
+
+    Недостающие колонки получают значения по умолчанию (и auto_now),
+    посчитанные один раз для всей таблицы.
+    """
+    generated = [model._meta.get_field(name) for name in fields]
+    template = model()
+    others = [
+        field for field in model._meta.concrete_fields
+        if field not in generated
+    ]
+    constants = tuple(
+        field.get_db_prep_save(
+            field.pre_save(template, add=True), connection
+        )
+        for field in others
+    )
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in generated + others)
+    placeholders = ', '.join(['%s'] * (len(generated) + len(others)))
+    return (
+        f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+        f'VALUES ({placeholders})'
+    ), constants
+
+
+def write_database(generator, batch_size, progress=None):
+    """
+    Записывает набор в базу пачками через executemany.
+
+    Строки генератора уже содержат значения в формате базы, поэтому
+    вставка обходит построение объектов моделей и компиляцию каждого
+    значения в bulk_create; сигналы при этом не вызываются.
+    """
+    for table, (model, _, _, fields) in TABLES.items():
+        sql, constants = insert_statement(model, fields)
+        written = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            for batch in batched(getattr(generator, table)(), batch_size):
+                cursor.executemany(sql, [row + constants for row in batch])
+                written += len(batch)
+        if progress:
+            progress(table, written)
+
+
+def write_csv(generator, directory, progress=None):
+    """Записывает набор в CSV в формате import_csv."""
+    os.makedirs(directory, exist_ok=True)
+    for table, (_, filename, columns, _) in TABLES.items():
+        written = 0
+        with open(
+            os.path.join(directory, filename), 'w', encoding='utf-8',
+            newline=''
+        ) as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for row in getattr(generator, table)():
+                writer.writerow(row)
+                written += 1
+        if progress:
+            progress(table, written)
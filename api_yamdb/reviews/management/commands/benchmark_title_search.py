@@ -0,0 +1,56 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from reviews import search
+from reviews.models import Title
+
+# запуск: |python manage.py benchmark_title_search|
+
+
+class Command(BaseCommand):
+    """Сравнение поиска через FTS5 и через LIKE по произведениям."""
+
+    help = 'Замеряет время поиска произведений: FTS5 против LIKE.'
+
+    DEFAULT_QUERIES = ('побег', 'звёздные войны', 'история', 'король')
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*', default=self.DEFAULT_QUERIES)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--page-size', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            raise CommandError('Полнотекстовый поиск FTS5 недоступен.')
+        queryset = Title.objects.order_by('-year', 'name')
+        page_size = options['page_size']
+        for text in options['queries']:
+            like = queryset.filter(
+                Q(name__icontains=text) | Q(description__icontains=text)
+            )
+            fts = search.search_titles(queryset, text)
+            if fts is None:
+                continue
+            like_time, like_count = self.measure(
+                like, page_size, options['repeat']
+            )
+            fts_time, fts_count = self.measure(
+                fts, page_size, options['repeat']
+            )
+            self.stdout.write(
+                f'{text!r}: LIKE {like_time:.2f} мс ({like_count} шт.), '
+                f'FTS5 {fts_time:.2f} мс ({fts_count} шт.)'
+            )
+
+    def measure(self, queryset, page_size, repeat):
+        """Медианное время подсчёта и выборки первой страницы, мс."""
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = perf_counter()
+            count = queryset.count()
+            list(queryset[:page_size])
+            timings.append((perf_counter() - started) * 1000)
+        return median(timings), count
@@ -0,0 +1,80 @@
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import dataset, search
+from reviews.signals import data_rebuilt
+
+# запуск: |python manage.py generate_dataset --titles 10000 --reviews 200000|
+
+
+class Command(BaseCommand):
+    """Команда для генерации синтетического набора данных."""
+
+    help = (
+        'Генерирует пользователей, произведения, жанры, категории, отзывы '
+        'и комментарии с популярными произведениями и активными авторами. '
+        'Пишет в базу пачками или в CSV в формате import_csv.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200_000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--genres', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=1_000_000)
+        parser.add_argument('--reviews', type=int, default=20_000_000)
+        parser.add_argument('--comments', type=int, default=5_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель распределения Ципфа для популярности.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--csv', metavar='DIR',
+            help='Записать CSV в каталог вместо записи в базу.'
+        )
+
+    def handle(self, *args, **options):
+        sizes = {
+            name: options[name] for name in (
+                'users', 'categories', 'genres', 'titles', 'reviews',
+                'comments'
+            )
+        }
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError('Объёмы не могут быть отрицательными.')
+        for parent, child in (('users', 'reviews'), ('titles', 'reviews'),
+                              ('categories', 'titles'), ('genres', 'titles'),
+                              ('reviews', 'comments'), ('users', 'comments')):
+            if sizes[child] and not sizes[parent]:
+                raise CommandError(f'Для {child} нужны {parent}.')
+        if options['skew'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError('--skew и --batch-size должны быть больше 0.')
+        started = perf_counter()
+        if options['csv']:
+            generator = dataset.DatasetGenerator(
+                **sizes, seed=options['seed'], skew=options['skew']
+            )
+            dataset.write_csv(generator, options['csv'], self.progress)
+        else:
+            generator = dataset.DatasetGenerator(
+                **sizes, seed=options['seed'], skew=options['skew'],
+                start_ids=dataset.database_start_ids(),
+                format_date=dataset.database_date
+            )
+            dataset.write_database(
+                generator, options['batch_size'], self.progress
+            )
+            data_rebuilt.send(sender=self.__class__)
+            call_command('rebuild_ratings', stdout=self.stdout)
+            search.ensure_index()
+            if search.is_enabled():
+                call_command('rebuild_search_index', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Набор данных готов за {perf_counter() - started:.1f} с.'
+        ))
+
+    def progress(self, table, written):
+        self.stdout.write(f'{table}: {written}')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.ratings import rebuild_title_ratings
+from reviews.signals import data_rebuilt
+
+# проверить работоспособность командой |python manage.py rebuild_ratings|
+
+
+class Command(BaseCommand):
+    """Команда для полного пересчёта рейтингов произведений."""
+
+    help = 'Пересчитывает сумму оценок, число отзывов и рейтинг произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_title_ratings()
+        data_rebuilt.send(sender=self.__class__)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитаны рейтинги произведений: {updated}')
+        )
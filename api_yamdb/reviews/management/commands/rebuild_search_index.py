@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews import search
+from reviews.signals import data_rebuilt
+
+# проверить работоспособность командой |python manage.py rebuild_search_index|
+
+
+class Command(BaseCommand):
+    """Команда для перестроения полнотекстового индекса произведений."""
+
+    help = 'Перестраивает FTS5-индекс названий и описаний произведений.'
+
+    def handle(self, *args, **options):
+        search.ensure_index()
+        if not search.is_enabled():
+            raise CommandError('Полнотекстовый поиск FTS5 недоступен.')
+        with transaction.atomic():
+            indexed = search.rebuild_index()
+        data_rebuilt.send(sender=self.__class__)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {indexed}')
+        )
@@ -22,6 +22,9 @@ class CategoryGenreBase(models.Model):
     class Meta:
         abstract = True
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name'], name='%(class)s_name_idx')
+        ]
 
     def __str__(self):
         return self.name
@@ -69,16 +72,142 @@ class Title(models.Model):
         through='TitleGenre',
         verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+
+    AGGREGATE_FIELDS = ('score_sum', 'reviews_count', 'rating')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year', 'name',)
         default_related_name = 'titles'
+        indexes = [
+            models.Index(
+                fields=['-year', 'name', 'id'],
+                name='title_year_name_idx'
+            ),
+            models.Index(
+                fields=['category', '-year', 'name'],
+                name='title_category_year_name_idx'
+            ),
+            models.Index(fields=['rating'], name='title_rating_idx'),
+            models.Index(
+                fields=['reviews_count'], name='title_reviews_count_idx'
+            ),
+        ]
 
     def __str__(self):
         return (self.name[:STR_LENGTH])
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет произведение, не затирая агрегаты оценок.
+
+        Агрегаты обновляются только сигналами отзывов, поэтому при
+        обновлении существующей записи они исключаются из UPDATE.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.AGGREGATE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class TitleScoreStats(models.Model):
+    """
+    Распределение оценок произведения.
+
+    По одному счётчику на каждую допустимую оценку; поля
+    `score_<N>` добавляются ниже для диапазона RATING_MIN_VALUE..
+    RATING_MAX_VALUE.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_stats',
+        verbose_name='Произведение'
+    )
+
+    SCORES = range(RATING_MIN_VALUE, RATING_MAX_VALUE + 1)
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'Оценки {self.title_id}'
+
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def histogram(self):
+        return {
+            score: getattr(self, self.score_field(score))
+            for score in self.SCORES
+        }
+
+    @property
+    def count(self):
+        return sum(self.histogram.values())
+
+    @property
+    def mean(self):
+        count = self.count
+        if not count:
+            return None
+        return sum(
+            score * number for score, number in self.histogram.items()
+        ) / count
+
+    @property
+    def median(self):
+        count = self.count
+        if not count:
+            return None
+        middle = [(count - 1) // 2, count // 2]
+        values = []
+        seen = 0
+        for score, number in self.histogram.items():
+            seen += number
+            while middle and middle[0] < seen:
+                values.append(score)
+                middle.pop(0)
+        return sum(values) / len(values)
+
+
+for _score in TitleScoreStats.SCORES:
+    TitleScoreStats.add_to_class(
+        TitleScoreStats.score_field(_score),
+        models.PositiveIntegerField(
+            default=0, verbose_name=f'Количество оценок {_score}'
+        )
+    )
+del _score
+
 
 class TitleGenre(models.Model):
     """ Модель связывающая произведения и жанры."""
@@ -103,6 +232,12 @@ class TitleGenre(models.Model):
                 name='unique_id_title_genre'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='titlegenre_genre_title_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.title}-{self.genre}'
@@ -122,6 +257,10 @@ class AuthorContentModel(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         abstract = True
@@ -160,6 +299,12 @@ class Review(AuthorContentModel):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
@@ -170,6 +315,14 @@ class Review(AuthorContentModel):
             f'Оценка: {self.score}.'
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные оценку и произведение для сигналов."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
 
 class Comment(AuthorContentModel):
     """Модель комментария к отзыву на произведение."""
@@ -181,6 +334,12 @@ class Comment(AuthorContentModel):
     )
 
     class Meta(AuthorContentModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['reviews', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
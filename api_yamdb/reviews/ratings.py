@@ -0,0 +1,146 @@
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from reviews.models import Review, Title, TitleScoreStats
+
+STATS_BATCH_SIZE = 1000
+
+
+def rating_expression(score_sum, reviews_count):
+    """Выражение среднего балла; NULL, если отзывов нет."""
+    return Cast(score_sum, FloatField()) / NullIf(reviews_count, 0)
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """
+    Атомарно сдвигает агрегаты оценок произведения.
+
+    Один UPDATE с F-выражениями: конкурентные отзывы не теряют
+    изменений друг друга.
+    """
+    if not score_delta and not count_delta:
+        return
+    score_sum = F('score_sum') + score_delta
+    reviews_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=rating_expression(score_sum, reviews_count),
+        updated_at=timezone.now(),
+    )
+
+
+def count_scores(title_ids=None):
+    """Распределение оценок по отзывам: {title_id: {score: count}}."""
+    reviews = Review.objects.order_by()
+    if title_ids is not None:
+        reviews = reviews.filter(title_id__in=title_ids)
+    histograms = defaultdict(dict)
+    for title_id, score, number in (
+        reviews.values('title_id', 'score')
+        .annotate(number=Count('id'))
+        .values_list('title_id', 'score', 'number')
+    ):
+        histograms[title_id][score] = number
+    return histograms
+
+
+def build_score_stats(title_id, histogram):
+    return TitleScoreStats(title_id=title_id, **{
+        TitleScoreStats.score_field(score): number
+        for score, number in histogram.items()
+    })
+
+
+def update_score_stats(title_id, score_deltas):
+    """
+    Атомарно сдвигает счётчики распределения оценок произведения.
+
+    Если строки распределения ещё нет, она создаётся по отзывам из базы,
+    которые к этому моменту уже учитывают изменение. Только удаление
+    оценок строку не создаёт: так каскадное удаление произведения не
+    оставляет осиротевших распределений.
+    """
+    changes = {
+        TitleScoreStats.score_field(score): F(
+            TitleScoreStats.score_field(score)
+        ) + delta
+        for score, delta in score_deltas.items() if delta
+    }
+    if not changes:
+        return
+    if TitleScoreStats.objects.filter(title_id=title_id).update(**changes):
+        return
+    if max(score_deltas.values()) <= 0:
+        return
+    if not Title.objects.filter(pk=title_id).exists():
+        return
+    histogram = count_scores([title_id]).get(title_id, {})
+    try:
+        with transaction.atomic():
+            build_score_stats(title_id, histogram).save(force_insert=True)
+    except IntegrityError:
+        TitleScoreStats.objects.filter(title_id=title_id).update(**changes)
+
+
+def apply_review_change(old, new):
+    """
+    Учитывает замену оценки old на new в агрегатах произведений.
+
+    old и new — пары (title_id, score) или None для созданного и
+    удалённого отзыва соответственно.
+    """
+    changes = defaultdict(Counter)
+    if old is not None:
+        changes[old[0]][old[1]] -= 1
+    if new is not None:
+        changes[new[0]][new[1]] += 1
+    for title_id, score_deltas in changes.items():
+        update_title_rating(
+            title_id,
+            sum(score * delta for score, delta in score_deltas.items()),
+            sum(score_deltas.values())
+        )
+        update_score_stats(title_id, score_deltas)
+
+
+def rebuild_title_ratings():
+    """Пересчитывает агрегаты оценок всех произведений с нуля."""
+    reviews = (
+        Review.objects
+        .filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+    )
+    Title.objects.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+    rebuild_score_stats()
+    return Title.objects.update(
+        rating=rating_expression(F('score_sum'), F('reviews_count')),
+        updated_at=timezone.now(),
+    )
+
+
+def rebuild_score_stats():
+    """Пересоздаёт распределения оценок всех произведений."""
+    histograms = count_scores()
+    TitleScoreStats.objects.all().delete()
+    batch = []
+    for title_id in Title.objects.values_list('pk', flat=True).iterator():
+        batch.append(build_score_stats(title_id, histograms.get(title_id, {})))
+        if len(batch) >= STATS_BATCH_SIZE:
+            TitleScoreStats.objects.bulk_create(batch)
+            batch = []
+    TitleScoreStats.objects.bulk_create(batch)
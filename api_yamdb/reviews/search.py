@@ -0,0 +1,165 @@
+import logging
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Title
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'reviews_title_fts'
+FTS_COLUMNS = ('name', 'description')
+TOKEN_RE = re.compile(r'\w+')
+YO_TRANSLATION = str.maketrans('ёЁ', 'еЕ')
+
+_state = {'available': None}
+
+
+def normalize(text):
+    """Приводит текст к виду, в котором он хранится в индексе."""
+    return (text or '').translate(YO_TRANSLATION)
+
+
+def is_enabled():
+    """Проверяет, что полнотекстовый индекс FTS5 доступен."""
+    if not getattr(settings, 'TITLE_FULLTEXT_SEARCH', True):
+        return False
+    if connection.vendor != 'sqlite':
+        return False
+    if _state['available'] is None:
+        _state['available'] = (
+            FTS_TABLE in connection.introspection.table_names()
+        )
+    return _state['available']
+
+
+def build_match_query(text, columns=None):
+    """
+    Строит выражение MATCH из пользовательского ввода.
+
+    Каждое слово ищется как префикс, слова объединяются через AND.
+    Возвращает None, если во вводе нет ни одного слова.
+    """
+    tokens = TOKEN_RE.findall(normalize(text).lower())
+    if not tokens:
+        return None
+    terms = ' '.join(f'"{token}"*' for token in tokens)
+    if columns:
+        return f'{{{" ".join(columns)}}} : ({terms})'
+    return terms
+
+
+def ensure_index():
+    """
+    Создаёт таблицу индекса и перестраивает её при рассинхронизации.
+
+    Вызывается после migrate и flush: индекс не является моделью,
+    поэтому Django сам его не создаёт и не очищает.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    if Title._meta.db_table not in connection.introspection.table_names():
+        return
+    columns = ', '.join(FTS_COLUMNS)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+                f"USING fts5({columns}, tokenize='unicode61')"
+            )
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+            indexed = cursor.fetchone()[0]
+    except DatabaseError as error:
+        logger.warning('Полнотекстовый поиск недоступен: %s', error)
+        _state['available'] = False
+        return
+    _state['available'] = True
+    if indexed != Title.objects.count():
+        rebuild_index()
+
+
+def rebuild_index():
+    """Полностью перестраивает индекс по таблице произведений."""
+    columns = ', '.join(FTS_COLUMNS)
+    normalized = ', '.join(
+        f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+        for column in FTS_COLUMNS
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+            f'SELECT id, {normalized} FROM {Title._meta.db_table}'
+        )
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def index_titles(titles):
+    """Добавляет или обновляет произведения в индексе."""
+    if not is_enabled():
+        return
+    rows = [
+        (title.pk, *(normalize(getattr(title, column))
+                     for column in FTS_COLUMNS))
+        for title in titles
+    ]
+    if not rows:
+        return
+    unindex_titles(row[0] for row in rows)
+    columns = ', '.join(FTS_COLUMNS)
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+            f'VALUES ({placeholders})',
+            rows
+        )
+
+
+def unindex_titles(title_ids):
+    """Удаляет произведения из индекса."""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(title_id,) for title_id in title_ids]
+        )
+
+
+def filter_titles(queryset, text, columns=None):
+    """Фильтрует произведения по индексу без ранжирования."""
+    match = build_match_query(text, columns)
+    if match is None:
+        return None
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match,)
+    ))
+
+
+def search_titles(queryset, text, columns=None):
+    """
+    Фильтрует произведения по индексу и сортирует по релевантности.
+
+    Если запрос уже ранжирован, повторно таблица индекса не
+    присоединяется: условие добавляется как подзапрос.
+    """
+    if 'search_rank' in queryset.query.extra:
+        return filter_titles(queryset, text, columns)
+    match = build_match_query(text, columns)
+    if match is None:
+        return None
+    title_table = Title._meta.db_table
+    return queryset.extra(
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {title_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+    ).order_by('search_rank', *queryset.query.order_by)
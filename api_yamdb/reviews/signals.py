@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reviews import search
+from reviews.models import Review, Title, TitleScoreStats
+from reviews.ratings import apply_review_change
+
+# Отправляется после массовой записи произведений в обход save():
+# аргументы created и updated — списки сохранённых произведений.
+titles_bulk_saved = Signal()
+# Отправляется командами, которые переписывают таблицы в обход save()
+# и сигналов моделей: пересчёт рейтингов, индекса, генерация данных.
+data_rebuilt = Signal()
+
+
+def ensure_search_index(sender, **kwargs):
+    """Создаёт и при необходимости перестраивает поисковый индекс."""
+    search.ensure_index()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Учитывает новую или изменённую оценку в агрегатах произведения."""
+    if raw:
+        return
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    old = None
+    if not created and loaded_title_id is not None:
+        old = (loaded_title_id, instance._loaded_score)
+    new = (instance.title_id, instance.score)
+    if old != new:
+        apply_review_change(old, new)
+    instance._loaded_score = instance.score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключает удалённую оценку, в том числе при каскадном удалении."""
+    apply_review_change((instance.title_id, instance.score), None)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw=False, **kwargs):
+    """Обновляет произведение в поисковом индексе."""
+    if raw:
+        return
+    if created:
+        TitleScoreStats.objects.create(title=instance)
+    search.index_titles([instance])
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    """Удаляет произведение из поискового индекса."""
+    search.unindex_titles([instance.pk])
+
+
+@receiver(titles_bulk_saved)
+def titles_bulk_saved_handler(sender, created, updated, **kwargs):
+    """Дополняет массово сохранённые произведения, как post_save."""
+    TitleScoreStats.objects.bulk_create(
+        [TitleScoreStats(title=title) for title in created],
+        ignore_conflicts=True
+    )
+    search.index_titles(created + updated)
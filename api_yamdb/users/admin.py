@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from reviews.models import Category, Comment, Genre, Review, Title
-from users.models import Account
+from users.models import Account, OutgoingMail
 
 
 @admin.register(Account)
@@ -40,7 +40,9 @@ class GenreAdmin(admin.ModelAdmin):
 
 @admin.register(Title)
 class TitlesAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'year', 'get_genres_list', 'category')
+    list_display = (
+        'pk', 'name', 'year', 'get_genres_list', 'category', 'rating'
+    )
     search_fields = ('name', 'category__name')
 
     @admin.display(description=_('Жанры'))
@@ -60,3 +62,12 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ('pk', 'reviews', 'author', 'text', 'pub_date')
     search_fields = ('text',)
     list_editable = ('text', 'author')
+
+
+@admin.register(OutgoingMail)
+class OutgoingMailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'recipient', 'subject', 'created_at', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient', 'subject')
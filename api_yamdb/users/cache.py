@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from datetime import datetime, timezone
+from time import monotonic, time, time_ns
+
+from django.core.cache import cache
+
+from api_yamdb.constants import USER_CACHE_MAX_SIZE, USER_CACHE_TIMEOUT
+
+VERSION_KEY = 'users:account-version:{user_id}'
+# Время последнего изменения любого существующего пользователя, мкс:
+# по нему устаревают ответы, где показаны имена авторов.
+ACCOUNTS_CHANGED_KEY = 'users:accounts-changed'
+HIT = 'hits'
+MISS = 'misses'
+
+
+def get_version(user_id):
+    """
+    Общая для процессов версия строки пользователя.
+
+    Новый счётчик начинается с отметки времени, чтобы после вытеснения
+    ключа из кэша версия не совпала со старой.
+    """
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time() * 1000))
+        version = cache.get(key)
+    return version
+
+
+def bump_version(user_id):
+    """Инвалидирует пользователя во всех процессах."""
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time() * 1000))
+
+
+def accounts_changed_at():
+    """Отметка последнего изменения пользователей, datetime UTC."""
+    stamp = cache.get(ACCOUNTS_CHANGED_KEY)
+    if stamp is None:
+        cache.add(ACCOUNTS_CHANGED_KEY, time_ns() // 1000)
+        stamp = cache.get(ACCOUNTS_CHANGED_KEY)
+    return datetime.fromtimestamp(stamp / 1_000_000, timezone.utc)
+
+
+def touch_accounts():
+    """Отмечает изменение пользователя для всех процессов."""
+    cache.set(ACCOUNTS_CHANGED_KEY, time_ns() // 1000, None)
+
+
+class UserCache:
+    """
+    Ограниченный LRU-кэш пользователей в памяти процесса.
+
+    Запись действительна, пока не истёк `timeout` и версия пользователя
+    в общем кэше совпадает с той, при которой строка была загружена.
+    Наружу отдаются копии, чтобы изменения в одном запросе не попадали
+    в другие.
+    """
+
+    def __init__(self, maxsize=USER_CACHE_MAX_SIZE,
+                 timeout=USER_CACHE_TIMEOUT):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._stats = {HIT: 0, MISS: 0}
+
+    def get(self, user_id, load):
+        """Пользователь из кэша или результат `load()` при промахе."""
+        version = get_version(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (
+                entry is not None
+                and entry[0] == version
+                and entry[1] > monotonic()
+            ):
+                self._entries.move_to_end(user_id)
+                self._stats[HIT] += 1
+                return copy(entry[2])
+            self._stats[MISS] += 1
+        user = load()
+        with self._lock:
+            self._entries[user_id] = (
+                version, monotonic() + self.timeout, user
+            )
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy(user)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats = {HIT: 0, MISS: 0}
+
+    def stats(self):
+        """Попадания, промахи, доля попаданий и заполненность кэша."""
+        with self._lock:
+            requests = self._stats[HIT] + self._stats[MISS]
+            return {
+                **self._stats,
+                'hit_rate': self._stats[HIT] / requests if requests else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+accounts = UserCache()
@@ -0,0 +1,53 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from api_yamdb.constants import (MAIL_OUTBOX_BATCH_SIZE,
+                                 MAIL_OUTBOX_MAX_ATTEMPTS,
+                                 MAIL_OUTBOX_POLL_INTERVAL)
+from users.outbox import send_pending
+
+# разовая отправка: |python manage.py send_mail_outbox|
+# фоновый обработчик: |python manage.py send_mail_outbox --loop|
+
+
+class Command(BaseCommand):
+    """Команда для отправки писем из очереди outbox."""
+
+    help = 'Отправляет накопившиеся письма пачками через одно соединение.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=MAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAIL_OUTBOX_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых писем.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=MAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза между проверками очереди в режиме --loop, секунды.'
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending(
+                options['batch_size'], options['max_attempts']
+            )
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, ошибок: {failed}'
+                )
+            if sent + failed < options['batch_size']:
+                if not options['loop']:
+                    break
+                sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Всего отправлено: {total_sent}, ошибок: {total_failed}'
+        ))
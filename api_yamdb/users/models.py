@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 from api_yamdb.constants import (EMAIL_MAX_LENGTH, MY_USER_PROFILE, ROLE_ADMIN,
                                  ROLE_CHOICES, ROLE_MAX_LENGTH, ROLE_MODERATOR,
@@ -33,17 +34,46 @@ class Account(AbstractUser):
         blank=True,
         verbose_name='Биография'
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия токенов'
+    )
+
+    # Поля, копии которых хранятся в токене доступа.
+    TOKEN_FIELDS = ('role', 'is_staff', 'is_active')
 
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('id', 'username',)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные поля токена для сравнения при save()."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_fields = instance.get_token_fields()
+        return instance
+
+    def get_token_fields(self):
+        return tuple(self.__dict__.get(name) for name in self.TOKEN_FIELDS)
+
     def save(self, *args, **kwargs):
+        """
+        Сохраняет пользователя; при смене роли, статуса администратора
+        или активности выданные ранее токены перестают действовать.
+        """
         self.clean()
         if self.is_staff and self.role != ROLE_MODERATOR:
             self.role = ROLE_ADMIN
+        loaded = getattr(self, '_loaded_token_fields', None)
+        if loaded is not None and loaded != self.get_token_fields():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
         super().save(*args, **kwargs)
+        self._loaded_token_fields = self.get_token_fields()
 
     def clean(self):
         super().clean()
@@ -67,3 +97,48 @@ class Account(AbstractUser):
 
     def is_admin(self):
         return self.role == ROLE_ADMIN or self.is_staff
+
+
+class OutgoingMail(models.Model):
+    """
+    Письмо в очереди на отправку (outbox).
+
+    Строка пишется в той же транзакции, что и изменение данных,
+    а отправляет её users.outbox.send_pending.
+    """
+
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(
+        max_length=EMAIL_MAX_LENGTH, verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=EMAIL_MAX_LENGTH, verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Создано'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now, verbose_name='Отправить после'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Отправлено'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after', 'id')
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'send_after'],
+                name='outgoingmail_pending_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
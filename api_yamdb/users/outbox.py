@@ -0,0 +1,208 @@
+import logging
+from datetime import timedelta
+from threading import Event, Lock, Thread
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from api_yamdb.constants import (MAIL_OUTBOX_BATCH_SIZE,
+                                 MAIL_OUTBOX_CLAIM_TIMEOUT,
+                                 MAIL_OUTBOX_MAX_ATTEMPTS,
+                                 MAIL_OUTBOX_MAX_RETRY_DELAY,
+                                 MAIL_OUTBOX_POLL_INTERVAL,
+                                 MAIL_OUTBOX_RETRY_DELAY)
+from users.models import OutgoingMail
+
+logger = logging.getLogger(__name__)
+
+THREAD = 'thread'
+WORKER = 'worker'
+EAGER = 'eager'
+
+
+def enqueue(subject, message, recipient_list, from_email=None):
+    """
+    Ставит письма в очередь в текущей транзакции.
+
+    После её фиксации письма отправляет фоновый поток (thread), команда
+    send_mail_outbox (worker) или, только для тестов, сам запрос
+    (eager). Неотправленные письма остаются в очереди для повторов.
+    """
+    mails = OutgoingMail.objects.bulk_create(
+        OutgoingMail(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipient=recipient,
+        )
+        for recipient in recipient_list
+    )
+    if settings.MAIL_OUTBOX_DELIVERY == THREAD:
+        transaction.on_commit(sender.notify)
+    elif settings.MAIL_OUTBOX_DELIVERY == EAGER:
+        ids = [mail.pk for mail in mails]
+        transaction.on_commit(lambda: send_pending(ids=ids))
+    return mails
+
+
+def drain(batch_size=MAIL_OUTBOX_BATCH_SIZE,
+          max_attempts=MAIL_OUTBOX_MAX_ATTEMPTS):
+    """Отправляет пачками все письма, которые пора отправить."""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = send_pending(batch_size, max_attempts)
+        total_sent += sent
+        total_failed += failed
+        if sent + failed < batch_size:
+            return total_sent, total_failed
+
+
+class OutboxSender:
+    """
+    Фоновый поток процесса, разбирающий очередь писем (режим thread).
+
+    Поток запускается при первом письме процесса. Он просыпается после
+    фиксации новых писем и раз в `interval` секунд, чтобы отправить
+    отложенные повторы, и каждый раз отправляет все письма, которые
+    пора отправить, пачками через одно соединение.
+    """
+
+    def __init__(self, interval=MAIL_OUTBOX_POLL_INTERVAL):
+        self.interval = interval
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._lock = Lock()
+        self._thread = None
+
+    def notify(self):
+        """Будит поток, при необходимости запуская его."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = Thread(
+                    target=self._run, name='mail-outbox', daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        """Останавливает поток после текущей пачки."""
+        self._stopped.set()
+        self._wakeup.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                drain()
+            except Exception:
+                logger.exception('Не удалось разобрать очередь писем.')
+            finally:
+                connections.close_all()
+
+
+sender = OutboxSender()
+
+
+def retry_delay(attempts):
+    """Экспоненциальная пауза перед повторной отправкой, секунды."""
+    return min(
+        MAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        MAIL_OUTBOX_MAX_RETRY_DELAY
+    )
+
+
+def pending(now=None, max_attempts=MAIL_OUTBOX_MAX_ATTEMPTS):
+    """Письма, которые пора отправить."""
+    return OutgoingMail.objects.filter(
+        sent_at__isnull=True,
+        send_after__lte=now or timezone.now(),
+        attempts__lt=max_attempts,
+    ).order_by('send_after', 'id')
+
+
+def claim(mails, now):
+    """
+    Забирает письма у параллельных обработчиков.
+
+    Каждое письмо откладывается условным UPDATE по прочитанным
+    attempts и send_after на MAIL_OUTBOX_CLAIM_TIMEOUT секунд: второй
+    обработчик, прочитавший ту же строку, не обновит ни одной строки и
+    письмо пропустит. Если обработчик упадёт, письмо вернётся в
+    очередь по истечении паузы.
+    """
+    lease = now + timedelta(seconds=MAIL_OUTBOX_CLAIM_TIMEOUT)
+    claimed = []
+    for mail in mails:
+        if OutgoingMail.objects.filter(
+            pk=mail.pk,
+            sent_at__isnull=True,
+            attempts=mail.attempts,
+            send_after=mail.send_after,
+        ).update(send_after=lease):
+            mail.send_after = lease
+            claimed.append(mail)
+    return claimed
+
+
+def send_pending(batch_size=MAIL_OUTBOX_BATCH_SIZE,
+                 max_attempts=MAIL_OUTBOX_MAX_ATTEMPTS, ids=None):
+    """
+    Отправляет пачку писем через одно SMTP-соединение.
+
+    Письма сначала забираются claim(), поэтому параллельные
+    обработчики не отправляют одно письмо дважды. Неудачные письма
+    получают паузу, растущую с числом попыток; после max_attempts
+    попыток письмо больше не отправляется. Возвращает пару
+    (отправлено, не отправлено).
+    """
+    now = timezone.now()
+    queryset = pending(now, max_attempts=max_attempts)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    mails = claim(list(queryset[:batch_size]), now)
+    if not mails:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        failed = [(mail, error) for mail in mails]
+    else:
+        try:
+            for mail in mails:
+                try:
+                    connection.send_messages([EmailMessage(
+                        subject=mail.subject,
+                        body=mail.body,
+                        from_email=mail.from_email,
+                        to=[mail.recipient],
+                        connection=connection,
+                    )])
+                except Exception as error:
+                    failed.append((mail, error))
+                else:
+                    sent.append(mail.pk)
+        finally:
+            connection.close()
+    now = timezone.now()
+    OutgoingMail.objects.filter(pk__in=sent).update(sent_at=now)
+    for mail, error in failed:
+        mail.attempts += 1
+        mail.send_after = now + timedelta(seconds=retry_delay(mail.attempts))
+        mail.last_error = repr(error)
+    OutgoingMail.objects.bulk_update(
+        [mail for mail, _ in failed],
+        ('attempts', 'send_after', 'last_error')
+    )
+    return len(sent), len(failed)
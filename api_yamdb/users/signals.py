@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.cache import bump_version, touch_accounts
+from users.models import Account
+from users.tokens import forget_token_version
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def account_changed(sender, instance, created=False, **kwargs):
+    """
+    Сбрасывает закэшированные версию токенов и строку пользователя.
+
+    Версия токенов сбрасывается и версия строки увеличивается ещё раз
+    после фиксации транзакции: иначе параллельный запрос мог бы
+    закэшировать значения до изменения. Изменение существующего
+    пользователя (имя автора в отзывах) отмечается и для валидаторов
+    условного GET.
+    """
+    user_id = instance.pk
+    forget_token_version(user_id)
+    transaction.on_commit(lambda: forget_token_version(user_id))
+    bump_version(user_id)
+    transaction.on_commit(lambda: bump_version(user_id))
+    if not created:
+        touch_accounts()
+        transaction.on_commit(touch_accounts)
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.constants import TOKEN_VERSION_CACHE_TIMEOUT
+from users.models import Account
+
+ROLE_CLAIM = 'role'
+STAFF_CLAIM = 'is_staff'
+VERSION_CLAIM = 'token_version'
+VERSION_KEY = 'users:token-version:{user_id}'
+# Версия удалённого или неактивного пользователя: не совпадёт ни с одной.
+REVOKED = -1
+
+
+def access_token_for(user):
+    """Токен доступа с ролью, статусом администратора и версией токенов."""
+    token = AccessToken.for_user(user)
+    token[ROLE_CLAIM] = user.role
+    token[STAFF_CLAIM] = user.is_staff
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """Действующая версия токенов пользователя (кэшируется)."""
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        row = Account.objects.filter(pk=user_id).values_list(
+            'token_version', 'is_active'
+        ).first()
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(VERSION_KEY.format(user_id=user_id))
+
+
+def revoke_tokens(user):
+    """
+    Отзывает все выданные пользователю токены.
+
+    Кэш версии сбрасывается и после фиксации транзакции, чтобы запрос
+    между ними не закэшировал старую версию.
+    """
+    user_id = user.pk
+    Account.objects.filter(pk=user_id).update(
+        token_version=F('token_version') + 1
+    )
+    forget_token_version(user_id)
+    transaction.on_commit(lambda: forget_token_version(user_id))
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
@@ -29,3 +31,9 @@ if FILENAME not in project_dir_content:
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def mail_outbox_eager(settings):
+    """Письма из outbox отправляются в запросе и сразу видны в mail.outbox."""
+    settings.MAIL_OUTBOX_DELIVERY = 'eager'
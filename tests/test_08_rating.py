@@ -0,0 +1,171 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from tests.utils import create_reviews
+
+from reviews.models import Title, TitleScoreStats
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    RATING_STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/rating-stats/'
+
+    def get_title(self, title_id):
+        return Title.objects.get(pk=title_id)
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client, moderator,
+                                              moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.reviews_count) == (15, 3), (
+            'Проверьте, что при создании отзыва обновляются сумма оценок и '
+            'количество отзывов произведения.'
+        )
+        assert title.rating == 5
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.reviews_count) == (12, 3), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'сумма оценок произведения.'
+        )
+        assert title.rating == 4
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.reviews_count) == (7, 2), (
+            'Проверьте, что при удалении отзыва он исключается из рейтинга '
+            'произведения.'
+        )
+
+        moderator.delete()
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.reviews_count) == (2, 1), (
+            'Проверьте, что при каскадном удалении отзывов вместе с автором '
+            'рейтинг произведения пересчитывается.'
+        )
+
+        user.delete()
+        title = self.get_title(title_id)
+        assert title.reviews_count == 0
+        assert title.rating is None
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') is None
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin, user,
+                                        user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+        TitleScoreStats.objects.all().delete()
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert admin_client.get(url).json()['rating'] is None
+
+        call_command('rebuild_ratings', stdout=StringIO())
+
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.reviews_count) == (10, 2), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'агрегаты оценок по отзывам.'
+        )
+        assert title.rating == 5
+        assert title.score_stats.histogram[5] == 2
+        assert self.get_title(titles[1]['id']).rating is None
+        assert admin_client.get(url).json()['rating'] == 5, (
+            'Проверьте, что после `rebuild_ratings` закэшированные ответы '
+            'произведений сбрасываются.'
+        )
+
+    def test_03_rating_stats_endpoint(self, client, admin_client, admin,
+                                      user, user_client, moderator,
+                                      moderator_client,
+                                      django_assert_num_queries):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        url = self.RATING_STATS_URL_TEMPLATE.format(title_id=title_id)
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{url}` доступен '
+            'неавторизованному пользователю.'
+        )
+        data = response.json()
+        histogram = {str(score): 0 for score in range(1, 11)}
+        histogram.update({'5': 2, '9': 1})
+        assert data == {
+            'count': 3,
+            'mean': 19 / 3,
+            'median': 5.0,
+            'histogram': histogram,
+        }, (
+            f'Проверьте, что `{url}` возвращает распределение, среднее и '
+            'медиану оценок произведения.'
+        )
+
+        empty = client.get(
+            self.RATING_STATS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        ).json()
+        assert empty['count'] == 0 and empty['median'] is None
+        assert client.get(
+            self.RATING_STATS_URL_TEMPLATE.format(title_id=0)
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            self.RATING_STATS_URL_TEMPLATE.format(title_id='abc')
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для нечислового id возвращается ответ со '
+            'статусом 404.'
+        )
+
+        moderator.delete()
+        assert client.get(url).json()['histogram']['5'] == 1
+
+    def test_04_title_delete_with_reviews(self, admin_client, admin, user,
+                                          user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not TitleScoreStats.objects.filter(
+            title_id=titles[0]['id']
+        ).exists()
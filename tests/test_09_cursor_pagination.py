@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        return Title.objects.bulk_create(
+            Title(name=f'Фильм {idx % 3}', year=1990 + idx % 4,
+                  category=category)
+            for idx in range(11)
+        )
+
+    def collect(self, client, url):
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            pages.append([title['id'] for title in data['results']])
+            url = data['next']
+        return pages
+
+    def test_01_page_number_is_default(self, client, titles):
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == len(titles), (
+            'Проверьте, что без параметров `/api/v1/titles/` по-прежнему '
+            'отдаёт постраничный вывод с ключом `count`.'
+        )
+
+    def test_02_cursor_walks_all_titles_in_order(self, client, titles):
+        expected = list(
+            Title.objects.order_by('-year', 'name', 'id')
+            .values_list('id', flat=True)
+        )
+        pages = self.collect(
+            client, f'{self.TITLES_URL}?pagination=cursor&page_size=4'
+        )
+        assert [len(page) for page in pages] == [4, 4, 3]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` обходит '
+            'все произведения в порядке (-year, name, id) без повторов.'
+        )
+
+    def test_03_cursor_previous_link(self, client, titles):
+        first = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&page_size=4'
+        ).json()
+        assert first['previous'] is None
+        second = client.get(first['next']).json()
+        previous = client.get(second['previous']).json()
+        assert previous['results'] == first['results'], (
+            'Проверьте, что ссылка `previous` курсорной пагинации '
+            'возвращает предыдущую страницу.'
+        )
+
+    def test_04_tampered_cursor_rejected(self, client, titles):
+        first = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&page_size=4'
+        ).json()
+        response = client.get(
+            first['next'].replace('cursor=', 'cursor=x', 1)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что изменённый курсор отклоняется.'
+        )
+
+    def test_05_comments_cursor_both_directions(self, client, user, titles):
+        review = Review.objects.create(
+            author=user, title=titles[0], text='Отзыв', score=5
+        )
+        Comment.objects.bulk_create(
+            Comment(author=user, reviews=review, text=f'Комментарий {idx}')
+            for idx in range(7)
+        )
+        url = (
+            f'{self.TITLES_URL}{titles[0].id}/reviews/{review.id}/comments/'
+        )
+        expected = list(
+            review.comments.order_by('pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        pages = self.collect(client, f'{url}?pagination=cursor&page_size=3')
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация комментариев обходит их в '
+            'порядке (pub_date, id).'
+        )
+
+        last = client.get(f'{url}?pagination=cursor&page_size=3').json()
+        while last['next']:
+            last = client.get(last['next']).json()
+        backwards = []
+        page = last
+        while page['previous']:
+            page = client.get(page['previous']).json()
+            backwards = [item['id'] for item in page['results']] + backwards
+        assert backwards == expected[:-len(last['results'])], (
+            'Проверьте, что курсорная пагинация комментариев поддерживает '
+            'обход в обратном направлении.'
+        )
@@ -0,0 +1,93 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.pagination import CachedCountPagination, NoCountPagination
+from reviews.models import Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10PaginationModes:
+
+    GENRES_URL = '/api/v1/genres/'
+
+    @pytest.fixture
+    def genres(self):
+        return Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx:02}', slug=f'genre-{idx}')
+            for idx in range(5)
+        )
+
+    def paginate(self, paginator, query=''):
+        request = Request(
+            APIRequestFactory().get(f'{self.GENRES_URL}?{query}')
+        )
+        page = paginator.paginate_queryset(
+            Genre.objects.order_by('name'), request
+        )
+        return page, paginator.get_paginated_response(
+            [genre.slug for genre in page]
+        ).data
+
+    def test_01_no_count_pagination(self, genres,
+                                    django_assert_num_queries):
+        paginator = NoCountPagination()
+        with django_assert_num_queries(1):
+            _, data = self.paginate(paginator, 'page_size=2&page=2')
+        assert 'count' not in data, (
+            'Проверьте, что `NoCountPagination` не выполняет COUNT(*).'
+        )
+        assert data['results'] == ['genre-2', 'genre-3']
+        assert 'page=3' in data['next']
+        assert data['previous'] is not None
+
+        _, data = self.paginate(NoCountPagination(), 'page_size=2&page=3')
+        assert data['results'] == ['genre-4']
+        assert data['next'] is None, (
+            'Проверьте, что `NoCountPagination` определяет последнюю '
+            'страницу по лишней строке.'
+        )
+
+    def test_02_cached_count_pagination(self, genres,
+                                        django_assert_num_queries):
+        cache.clear()
+        _, data = self.paginate(CachedCountPagination(), 'page_size=2')
+        assert data['count'] == len(genres)
+
+        Genre.objects.create(name='Жанр 99', slug='genre-99')
+        with django_assert_num_queries(1):
+            _, data = self.paginate(CachedCountPagination(), 'page_size=2')
+        assert data['count'] == len(genres), (
+            'Проверьте, что `CachedCountPagination` берёт `count` из кэша.'
+        )
+
+        cache.clear()
+        _, data = self.paginate(CachedCountPagination(), 'page_size=2')
+        assert data['count'] == len(genres) + 1
+
+    def test_03_title_modes(self, client):
+        cache.clear()
+        Title.objects.bulk_create(
+            Title(name=f'Фильм {idx}', year=2000) for idx in range(3)
+        )
+        url = '/api/v1/titles/?page_size=2&year=2000'
+        data = client.get(f'{url}&pagination=nocount').json()
+        assert 'count' not in data, (
+            'Проверьте, что `/api/v1/titles/?pagination=nocount` отдаёт '
+            'страницу без `count`.'
+        )
+        assert len(data['results']) == 2
+        assert data['next'] is not None
+
+        data = client.get(f'{url}&pagination=cached-count').json()
+        assert data['count'] == 3
+        Title.objects.create(name='Фильм 3', year=2000)
+        data = client.get(f'{url}&pagination=cached-count').json()
+        assert data['count'] == 3, (
+            'Проверьте, что `/api/v1/titles/?pagination=cached-count` '
+            'берёт `count` из кэша.'
+        )
+        assert client.get(url).json()['count'] == 4, (
+            'Проверьте, что без параметра `pagination` `count` точный.'
+        )
@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews import search
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        return [
+            Title.objects.create(
+                name='Ёжик в тумане', year=1975,
+                description='Мультфильм Юрия Норштейна'
+            ),
+            Title.objects.create(
+                name='Туманность Андромеды', year=1967,
+                description='Экранизация романа о ёжике и тумане'
+            ),
+            Title.objects.create(
+                name='Крепкий орешек', year=1988, description='Боевик'
+            ),
+        ]
+
+    def found(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_is_case_insensitive_for_cyrillic(self, client,
+                                                        titles):
+        assert search.is_enabled()
+        assert self.found(client, 'search=ЕЖИК') == [
+            titles[0].id, titles[1].id
+        ], (
+            'Проверьте, что `?search=` не зависит от регистра кириллицы, '
+            'не различает `е` и `ё` и ранжирует совпадения в названии выше.'
+        )
+
+    def test_02_name_filter_uses_only_name(self, client, titles):
+        assert self.found(client, 'name=туман') == [
+            titles[0].id, titles[1].id
+        ]
+        assert self.found(client, 'name=норштейн') == [], (
+            'Проверьте, что `?name=` ищет только по названию.'
+        )
+        assert self.found(client, 'name=крепкий орешек') == [titles[2].id]
+
+    def test_03_index_follows_changes(self, client, titles):
+        titles[2].name = 'Мягкий орешек'
+        titles[2].save()
+        assert self.found(client, 'search=крепкий') == []
+        assert self.found(client, 'search=мягкий') == [titles[2].id]
+        titles[2].delete()
+        assert self.found(client, 'search=орешек') == [], (
+            'Проверьте, что индекс обновляется при изменении и удалении '
+            'произведения.'
+        )
+
+    def test_04_rebuild_command(self, client, titles):
+        search.unindex_titles([title.id for title in titles])
+        assert self.found(client, 'search=боевик') == []
+        call_command('rebuild_search_index', stdout=StringIO())
+        assert self.found(client, 'search=боевик') == [titles[2].id]
@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import autocomplete, cache
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Autocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/autocomplete/'
+
+    @pytest.fixture
+    def catalogue(self):
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Фэнтези', slug='fantasy')
+        titles = [
+            Title.objects.create(name='Властелин колец', year=2001),
+            Title.objects.create(name='Война и мир', year=1966),
+            Title.objects.create(name='Фантастическая четвёрка', year=2005),
+        ]
+        return category, genre, titles
+
+    def suggest(self, client, query, limit=None):
+        url = f'{self.AUTOCOMPLETE_URL}?q={query}'
+        if limit:
+            url += f'&limit={limit}'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.AUTOCOMPLETE_URL}` не найден или недоступен '
+            'неавторизованному пользователю.'
+        )
+        return response.json()
+
+    def test_01_prefix_lookup(self, client, catalogue,
+                              django_assert_num_queries):
+        category, genre, titles = catalogue
+        self.suggest(client, 'в')
+        with django_assert_num_queries(0):
+            data = self.suggest(client, 'В')
+        assert [title['name'] for title in data['titles']] == [
+            'Властелин колец', 'Война и мир'
+        ], (
+            'Проверьте, что автодополнение ищет по началу названия без '
+            'учёта регистра и не обращается к базе данных.'
+        )
+        data = self.suggest(client, 'ф')
+        assert data['genres'] == [{'name': 'Фэнтези', 'slug': 'fantasy'}]
+        assert data['categories'] == [{'name': 'Фильмы', 'slug': 'films'}]
+        assert [title['id'] for title in data['titles']] == [titles[2].id]
+        assert self.suggest(client, 'четве')['titles'][0]['id'] == (
+            titles[2].id
+        ), 'Проверьте, что поиск работает по началу любого слова названия.'
+        assert len(self.suggest(client, 'в', limit=1)['titles']) == 1
+
+    def test_02_index_follows_signals(self, client, catalogue):
+        _, genre, titles = catalogue
+        self.suggest(client, 'в')
+        titles[1].name = 'Мир и война'
+        titles[1].save()
+        genre.delete()
+        Title.objects.create(name='Вий', year=1967)
+        data = self.suggest(client, 'в')
+        assert [title['name'] for title in data['titles']] == [
+            'Вий', 'Властелин колец', 'Мир и война'
+        ], (
+            'Проверьте, что индекс автодополнения обновляется сигналами '
+            'моделей.'
+        )
+        assert self.suggest(client, 'фэн')['genres'] == []
+
+    def test_03_other_process_writes(self, client, catalogue, monkeypatch,
+                                     django_assert_num_queries):
+        _, _, titles = catalogue
+        self.suggest(client, 'в')
+        Title.objects.filter(pk=titles[1].pk).update(name='Мир и война')
+        cache.bump_version(autocomplete.VERSION_RESOURCE)
+        with django_assert_num_queries(0):
+            stale = self.suggest(client, 'в')
+        assert [title['name'] for title in stale['titles']] == [
+            'Властелин колец', 'Война и мир'
+        ], (
+            'Проверьте, что пока индекс перестраивается в фоне, запросы '
+            'обслуживает прежний индекс.'
+        )
+        autocomplete.index.wait()
+        assert [title['name'] for title in self.suggest(client, 'в')[
+            'titles'
+        ]] == ['Властелин колец', 'Мир и война'], (
+            'Проверьте, что индекс перестраивается, когда общую версию '
+            'увеличил другой процесс.'
+        )
+
+        Title.objects.filter(pk=titles[0].pk).update(name='Кольца')
+        later = autocomplete.monotonic() + autocomplete.AUTOCOMPLETE_INDEX_TIMEOUT
+        monkeypatch.setattr(autocomplete, 'monotonic', lambda: later)
+        self.suggest(client, 'в')
+        autocomplete.index.wait()
+        assert [title['name'] for title in self.suggest(client, 'в')[
+            'titles'
+        ]] == ['Мир и война'], (
+            'Проверьте, что индекс перестраивается по истечении '
+            'AUTOCOMPLETE_INDEX_TIMEOUT.'
+        )
+
+    def test_04_writes_during_rebuild_are_kept(self, client, catalogue,
+                                               monkeypatch):
+        load = autocomplete.index.load
+
+        def load_then_write():
+            loaded = load()
+            Title.objects.create(name='Вий', year=1967)
+            return loaded
+
+        monkeypatch.setattr(autocomplete.index, 'load', load_then_write)
+        autocomplete.index.reset()
+        assert 'Вий' in [
+            title['name'] for title in self.suggest(client, 'в')['titles']
+        ], (
+            'Проверьте, что записи, сделанные во время перестройки '
+            'индекса, не теряются.'
+        )
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+
+from api.cache import get_stats
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        return Title.objects.create(name='Сталкер', year=1979,
+                                    category=category)
+
+    def test_01_repeated_reads_are_cached(self, client, title,
+                                          django_assert_num_queries):
+        first = client.get(f'{self.TITLES_URL}?page_size=5&year=1979')
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = client.get(f'{self.TITLES_URL}?year=1979&page_size=5')
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос к `/api/v1/titles/` с теми '
+            'же параметрами в любом порядке отдаётся из кэша.'
+        )
+        assert second.json() == first.json()
+
+    def test_02_writes_invalidate_cache(self, client, admin_client, title):
+        url = f'{self.TITLES_URL}{title.id}/'
+        client.get(url)
+        title.category.name = 'Кино'
+        title.category.save()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что изменение категории инвалидирует кэш '
+            'произведений.'
+        )
+
+        client.get(self.GENRES_URL)
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+
+        Genre.objects.all().delete()
+        assert client.get(self.GENRES_URL).json()['count'] == 0
+
+    def test_03_stats(self, client, title):
+        cache.clear()
+        client.get(self.GENRES_URL)
+        client.get(self.GENRES_URL)
+        assert get_stats()['genres'] == {'hits': 1, 'misses': 1}, (
+            'Проверьте, что кэш ответов считает попадания и промахи.'
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def title(self):
+        return Title.objects.create(name='Солярис', year=1972)
+
+    def test_01_title_detail_not_modified(self, client, title,
+                                          django_assert_max_num_queries):
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with django_assert_max_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304.'
+        )
+
+        title.description = 'Фильм Андрея Тарковского'
+        title.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag
+
+    def test_02_reviews_not_modified(self, client, title, user, admin):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        review = Review.objects.create(
+            author=user, title=title, text='Отзыв', score=7
+        )
+        response = client.get(url)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = client.get(f'{url}?page=1', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов зависит от параметров '
+            'запроса.'
+        )
+
+        review.text = 'Изменённый отзыв'
+        review.save()
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
+        etag = client.get(url)['ETag']
+
+        Review.objects.create(author=admin, title=title, text='Ещё', score=1)
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов.'
+        )
+
+    def test_03_title_detail_bad_id(self, client, title):
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id='abc')
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{url}` с нечисловым id '
+            'возвращает ответ со статусом 404.'
+        )
+
+    def test_04_reviews_author_renamed(self, client, title, user,
+                                       user_client):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        Review.objects.create(author=user, title=title, text='Отзыв', score=7)
+        response = client.get(url)
+        etag = response['ETag']
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется при смене имени '
+            'автора.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
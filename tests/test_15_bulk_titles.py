@@ -0,0 +1,104 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from api import autocomplete
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15BulkTitles:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    @pytest.fixture
+    def dimensions(self):
+        Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+
+    def payload(self, count, **extra):
+        return [
+            {
+                'name': f'Произведение {number}', 'year': 1970 + number,
+                'genre': ['drama', 'sci-fi'], 'category': 'films', **extra
+            }
+            for number in range(count)
+        ]
+
+    def test_01_create_in_constant_queries(self, admin_client, dimensions,
+                                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(12):
+            response = admin_client.post(
+                self.BULK_URL, data=self.payload(50), format='json'
+            )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        results = response.json()['results']
+        assert {result['status'] for result in results} == {'created'}
+        assert Title.objects.count() == 50
+        title = Title.objects.get(pk=results[0]['id'])
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'sci-fi'
+        }
+        assert autocomplete.index.search('произведение', 100)[
+            autocomplete.TITLES
+        ], 'Проверьте, что созданные произведения попадают в индексы.'
+
+    def test_02_ndjson_update_and_errors(self, admin_client, dimensions):
+        title = Title.objects.create(name='Старое название', year=1960)
+        lines = [
+            {'id': title.id, 'name': 'Новое название', 'year': 1961,
+             'genre': ['drama'], 'category': 'films'},
+            {'name': 'Без жанра', 'year': 1990, 'genre': ['unknown'],
+             'category': 'films'},
+            {'name': 'Из будущего', 'year': 3000, 'genre': ['drama'],
+             'category': 'films'},
+            {'id': title.id + 100, 'name': 'Нет такого', 'year': 1990,
+             'genre': ['drama'], 'category': 'films'},
+        ]
+        response = admin_client.post(
+            self.BULK_URL,
+            data='\n'.join(json.dumps(line) for line in lines),
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'updated', 'error', 'error', 'error'
+        ], (
+            'Проверьте, что ошибки возвращаются по каждому элементу, '
+            'а корректные элементы сохраняются.'
+        )
+        assert 'genre' in results[1]['errors']
+        assert 'year' in results[2]['errors']
+        assert 'id' in results[3]['errors']
+        title.refresh_from_db()
+        assert (title.name, title.year) == ('Новое название', 1961)
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
+        assert Title.objects.count() == 1
+
+    def test_03_permissions_and_bad_body(self, client, user_client,
+                                         admin_client, dimensions):
+        data = self.payload(1)
+        assert client.post(
+            self.BULK_URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            self.BULK_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовая загрузка доступна только администратору.'
+        )
+        assert admin_client.post(
+            self.BULK_URL, data=data[0], format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        assert admin_client.post(
+            self.BULK_URL, data=b'{"name": "\xff"}\n',
+            content_type='application/x-ndjson'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что NDJSON не в UTF-8 отклоняется со статусом 400.'
+        )
+        assert not Title.objects.exists()
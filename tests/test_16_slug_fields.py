@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.serializers import TitleCRUDSerializer
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SlugFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def genres(self):
+        Category.objects.create(name='Фильм', slug='films')
+        return [
+            Genre.objects.create(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(10)
+        ]
+
+    def test_01_genres_resolved_in_one_query(self, genres,
+                                             django_assert_num_queries):
+        data = {
+            'name': 'Сталкер', 'year': 1979, 'category': 'films',
+            'genre': [genre.slug for genre in reversed(genres)],
+        }
+        serializer = TitleCRUDSerializer(data=data)
+        with django_assert_num_queries(2):
+            assert serializer.is_valid(), serializer.errors
+        assert serializer.validated_data['genre'] == genres[::-1], (
+            'Проверьте, что все слаги жанров разрешаются одним запросом '
+            'с сохранением порядка.'
+        )
+
+    def test_02_unknown_slugs_reported_together(self, admin_client, genres):
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Сталкер', 'year': 1979, 'category': 'films',
+            'genre': ['genre-1', 'missing', 'genre-2', 'absent'],
+        }, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        message = response.json()['genre'][0]
+        assert 'missing' in message and 'absent' in message, (
+            'Проверьте, что неизвестные слаги жанров перечисляются в одной '
+            'ошибке.'
+        )
+        assert not Title.objects.exists()
+
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Сталкер', 'year': 1979, 'category': 'films',
+            'genre': ['genre-1', 'genre-1', 'genre-2'],
+        }, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'genre-1', 'genre-2'
+        ]
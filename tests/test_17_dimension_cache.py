@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import cache, dimensions
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17DimensionCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        titles = []
+        for number in range(5):
+            title = Title.objects.create(
+                name=f'Фильм {number}', year=1970 + number, category=category
+            )
+            title.genre.set([comedy, drama])
+            titles.append(title)
+        return titles
+
+    def test_01_list_does_not_load_dimensions(self, client, titles,
+                                              django_assert_num_queries):
+        client.get(f'{self.TITLES_URL}?page_size=2')
+        with django_assert_num_queries(3):
+            response = client.get(f'{self.TITLES_URL}?page_size=3')
+        title = response.json()['results'][0]
+        assert title['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert title['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ], (
+            'Проверьте, что категория и жанры произведения берутся из кэша '
+            'справочников и жанры отсортированы по названию.'
+        )
+
+    def test_02_shared_version_invalidates(self, client, titles):
+        client.get(f'{self.TITLES_URL}?page_size=1')
+        Genre.objects.filter(slug='drama').update(name='Трагедия')
+        cache.bump_version(cache.GENRES)
+        genres = client.get(f'{self.TITLES_URL}?page_size=2').json()[
+            'results'
+        ][0]['genre']
+        assert [genre['name'] for genre in genres] == [
+            'Комедия', 'Трагедия'
+        ], (
+            'Проверьте, что кэш справочников перечитывается при смене общей '
+            'версии ресурса.'
+        )
+
+    def test_03_other_process_writes(self, admin_client, client, titles,
+                                     monkeypatch):
+        client.get(f'{self.TITLES_URL}?page_size=1')
+        # bulk_create не отправляет сигналов и не меняет версию: так
+        # выглядит запись другого процесса при кэше в памяти процесса.
+        Category.objects.bulk_create([Category(name='Книга', slug='books')])
+        Genre.objects.bulk_create([Genre(name='Ужасы', slug='horror')])
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Оно', 'year': 1986, 'category': 'books',
+            'genre': ['horror', 'drama'],
+        })
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что слаги, которых нет в кэше справочников, '
+            'проверяются в базе.'
+        )
+        assert response.json()['category'] == {
+            'name': 'Книга', 'slug': 'books'
+        }
+        found = client.get(f'{self.TITLES_URL}?genre=horror').json()
+        assert [title['name'] for title in found['results']] == ['Оно']
+
+        Genre.objects.filter(slug='drama').update(name='Трагедия')
+        later = dimensions.monotonic() + dimensions.DIMENSION_CACHE_TIMEOUT
+        monkeypatch.setattr(dimensions, 'monotonic', lambda: later)
+        genres = client.get(f'{self.TITLES_URL}?year=1970').json()[
+            'results'
+        ][0]['genre']
+        assert [genre['name'] for genre in genres] == [
+            'Комедия', 'Трагедия'
+        ], (
+            'Проверьте, что снимок справочника перечитывается по истечении '
+            'DIMENSION_CACHE_TIMEOUT.'
+        )
@@ -0,0 +1,118 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def table_accesses(plan):
+    return [
+        detail for detail in plan
+        if detail.startswith(('SCAN ', 'SEARCH '))
+        and not detail.startswith('SCAN CONSTANT')
+    ]
+
+
+def is_scan(detail):
+    # Виртуальная таблица FTS5 ищет по собственному индексу (MATCH).
+    return detail.startswith('SCAN ') and 'VIRTUAL TABLE INDEX' not in detail
+
+
+def full_scan_reason(sql, plan):
+    """
+    Причина, по которой план считается полным просмотром, или None.
+
+    Просмотр таблицы (SCAN) допустим только для нефильтрованного чтения
+    в порядке индекса или полного COUNT(*). Полным просмотром считается
+    SCAN внутри соединения, SCAN при условии WHERE и SCAN с сортировкой
+    всей таблицы во временном B-дереве.
+    """
+    accesses = table_accesses(plan)
+    for position, detail in enumerate(accesses):
+        if not is_scan(detail):
+            continue
+        if position > 0:
+            return f'{detail} во внутреннем цикле соединения'
+        if ' WHERE ' in sql:
+            return f'{detail} при фильтрации'
+        if 'USE TEMP B-TREE FOR ORDER BY' in plan:
+            return f'{detail} с сортировкой всей таблицы'
+    return None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    @pytest.fixture
+    def urls(self, user):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Сталкер', year=1979, category=category
+        )
+        title.genre.set([genre])
+        review = Review.objects.create(
+            author=user, title=title, text='Отзыв', score=9
+        )
+        Comment.objects.create(author=user, reviews=review, text='Коммент')
+        title_url = f'/api/v1/titles/{title.id}/'
+        review_url = f'{title_url}reviews/{review.id}/'
+        return [
+            '/api/v1/titles/',
+            '/api/v1/titles/?pagination=cursor',
+            '/api/v1/titles/?year=1979',
+            '/api/v1/titles/?category=films',
+            '/api/v1/titles/?genre=drama',
+            '/api/v1/titles/?genre=drama,comedy&genre_match=all',
+            '/api/v1/titles/?category=films,books',
+            '/api/v1/titles/?search=сталкер',
+            '/api/v1/titles/?ordering=-rating',
+            '/api/v1/titles/?ordering=rating',
+            '/api/v1/titles/?ordering=-reviews_count',
+            '/api/v1/titles/?ordering=year',
+            '/api/v1/titles/?rating_min=5&ordering=-rating',
+            '/api/v1/titles/?year_min=1970&year_max=1990',
+            title_url,
+            f'{title_url}rating-stats/',
+            f'{title_url}reviews/',
+            f'{title_url}reviews/?pagination=cursor',
+            review_url,
+            f'{review_url}comments/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/users/',
+            '/api/v1/users/me/',
+            f'/api/v1/users/{user.username}/',
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def test_01_no_full_scans(self, admin_client, urls):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Планы запросов проверяются на SQLite.')
+        problems = []
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                admin_client.get(url)
+            for query in context.captured_queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT'):
+                    continue
+                reason = full_scan_reason(sql, self.explain(sql))
+                if reason:
+                    problems.append(f'{url}: {reason}\n    {sql}')
+        assert not problems, (
+            'Проверьте индексы: запросы эндпоинтов не должны приводить к '
+            'полному просмотру таблиц.\n' + '\n'.join(problems)
+        )
+
+    def test_02_checker_detects_full_scan(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Планы запросов проверяются на SQLite.')
+        sql = 'SELECT * FROM reviews_review WHERE text = \'Отзыв\''
+        assert full_scan_reason(sql, self.explain(sql)), (
+            'Проверьте, что проверка планов находит полный просмотр.'
+        )
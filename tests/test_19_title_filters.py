@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        both = Title.objects.create(name='Оба', year=2001, category=films)
+        both.genre.set([drama, comedy])
+        only_drama = Title.objects.create(
+            name='Драма', year=2000, category=books
+        )
+        only_drama.genre.set([drama])
+        only_comedy = Title.objects.create(name='Комедия', year=1999)
+        only_comedy.genre.set([comedy])
+        return both, only_drama, only_comedy
+
+    def found(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_genre_any_and_all(self, client, titles):
+        both, only_drama, only_comedy = titles
+        assert self.found(client, 'genre=drama,comedy') == [
+            both.id, only_drama.id, only_comedy.id
+        ], (
+            'Проверьте, что `?genre=a,b` возвращает произведения с любым из '
+            'жанров без повторов.'
+        )
+        assert self.found(client, 'genre=drama,comedy&genre_match=all') == [
+            both.id
+        ], 'Проверьте, что `genre_match=all` требует все жанры.'
+        assert self.found(client, 'genre=drama,horror') == [
+            both.id, only_drama.id
+        ]
+        assert self.found(client, 'genre=drama,horror&genre_match=all') == []
+        assert self.found(client, 'genre=horror') == []
+
+    def test_02_category(self, client, titles):
+        both, only_drama, _ = titles
+        assert self.found(client, 'category=films') == [both.id]
+        assert self.found(client, 'category=films,books') == [
+            both.id, only_drama.id
+        ]
+        assert self.found(client, 'category=music') == []
+
+    def test_03_benchmark_command(self, titles):
+        out = StringIO()
+        call_command(
+            'benchmark_title_filters', 'drama,comedy', '--all',
+            '--repeat=1', stdout=out
+        )
+        output = out.getvalue()
+        assert all(label in output for label in ('JOIN', 'EXISTS', 'IN'))
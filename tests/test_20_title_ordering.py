@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, user, admin, moderator):
+        low = Title.objects.create(name='Низкий', year=1980)
+        high = Title.objects.create(name='Высокий', year=1990)
+        unrated = Title.objects.create(name='Без оценок', year=2000)
+        popular = Title.objects.create(name='Популярный', year=1970)
+        Review.objects.create(author=user, title=low, text='-', score=2)
+        Review.objects.create(author=user, title=high, text='-', score=9)
+        for author, score in ((user, 6), (admin, 7), (moderator, 8)):
+            Review.objects.create(
+                author=author, title=popular, text='-', score=score
+            )
+        return low, high, unrated, popular
+
+    def found(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_ordering(self, client, titles):
+        low, high, unrated, popular = titles
+        assert self.found(client, 'ordering=-rating') == [
+            high.id, popular.id, low.id, unrated.id
+        ], (
+            'Проверьте, что `?ordering=-rating` сортирует произведения по '
+            'убыванию рейтинга, произведения без оценок — в конце.'
+        )
+        assert self.found(client, 'ordering=rating') == [
+            unrated.id, low.id, popular.id, high.id
+        ]
+        assert self.found(client, 'ordering=-reviews_count')[0] == popular.id
+        assert self.found(client, 'ordering=year') == [
+            popular.id, low.id, high.id, unrated.id
+        ]
+        assert self.found(client, 'ordering=password') == self.found(
+            client, ''
+        ), 'Проверьте, что неизвестный ключ сортировки игнорируется.'
+
+    def test_02_ranges(self, client, titles):
+        low, high, unrated, popular = titles
+        assert self.found(client, 'year_min=1975&year_max=1995') == [
+            high.id, low.id
+        ], 'Проверьте фильтры `year_min` и `year_max`.'
+        assert self.found(client, 'rating_min=7&ordering=-rating') == [
+            high.id, popular.id
+        ], 'Проверьте фильтр `rating_min`.'
+
+    def test_03_cursor_keeps_ordering(self, client, titles):
+        for ordering in ('-rating', 'rating', '-reviews_count', 'year'):
+            expected = self.found(client, f'ordering={ordering}')
+            url = (
+                f'{self.TITLES_URL}?ordering={ordering}'
+                '&pagination=cursor&page_size=1'
+            )
+            walked, last = [], None
+            while url:
+                last = client.get(url).json()
+                walked += [title['id'] for title in last['results']]
+                url = last['next']
+            assert walked == expected, (
+                'Проверьте, что курсорная пагинация обходит произведения в '
+                f'порядке `?ordering={ordering}`.'
+            )
+            previous = client.get(last['previous']).json()
+            assert [title['id'] for title in previous['results']] == (
+                expected[-2:-1]
+            )
+        first = client.get(
+            f'{self.TITLES_URL}?ordering=-rating&pagination=cursor&page_size=1'
+        ).json()
+        response = client.get(
+            first['next'].replace('ordering=-rating', 'ordering=year')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор другой сортировки отклоняется.'
+        )
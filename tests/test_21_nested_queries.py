@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21NestedQueries:
+    """
+    Число запросов вложенных эндпоинтов отзывов и комментариев.
+
+    Первый запрос в каждом случае — загрузка пользователя по токену.
+    """
+
+    @pytest.fixture
+    def data(self, admin):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        empty_title = Title.objects.create(name='Солярис', year=1972)
+        review = Review.objects.create(
+            author=admin, title=title, text='Отзыв', score=5
+        )
+        comment = Comment.objects.create(
+            author=admin, reviews=review, text='Комментарий'
+        )
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        review_url = f'{reviews_url}{review.id}/'
+        return {
+            'reviews': reviews_url,
+            'empty_reviews': f'/api/v1/titles/{empty_title.id}/reviews/',
+            'missing_reviews': '/api/v1/titles/0/reviews/',
+            'review': review_url,
+            'comments': f'{review_url}comments/',
+            'foreign_comments': (
+                f'/api/v1/titles/{empty_title.id}/reviews/{review.id}/'
+                'comments/'
+            ),
+            'comment': f'{review_url}comments/{comment.id}/',
+        }
+
+    @pytest.mark.parametrize('url_name, status, queries', (
+        ('reviews', HTTPStatus.OK, 4),
+        ('empty_reviews', HTTPStatus.OK, 3),
+        ('missing_reviews', HTTPStatus.NOT_FOUND, 3),
+        ('review', HTTPStatus.OK, 2),
+        ('comments', HTTPStatus.OK, 3),
+        ('foreign_comments', HTTPStatus.NOT_FOUND, 3),
+        ('comment', HTTPStatus.OK, 2),
+    ))
+    def test_01_reads(self, admin_client, data, django_assert_num_queries,
+                      url_name, status, queries):
+        with django_assert_num_queries(queries):
+            response = admin_client.get(data[url_name])
+        assert response.status_code == status, (
+            f'Проверьте ответ на GET-запрос к `{data[url_name]}`.'
+        )
+
+    def test_02_writes(self, user_client, admin_client, data,
+                       django_assert_num_queries):
+        # Вставка отзыва и пересчёт рейтинга идут в одной транзакции,
+        # автор для ответа загружается по author_id.
+        with django_assert_num_queries(8):
+            response = user_client.post(
+                data['reviews'], data={'text': 'Ещё', 'score': 7}
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'один раз.'
+        )
+        with django_assert_num_queries(4):
+            response = admin_client.post(
+                data['comments'], data={'text': 'Ответ'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        # Администратор уже в кэше пользователей после прошлого запроса,
+        # автор комментария загружается вместе с ним.
+        with django_assert_num_queries(2):
+            response = admin_client.patch(
+                data['comment'], data={'text': 'Правка'}
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_list_queries_do_not_grow(self, admin_client, data,
+                                         django_user_model,
+                                         django_assert_num_queries):
+        title = Title.objects.get(name='Сталкер')
+        review = Review.objects.get()
+        for number in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'reader{number}',
+                email=f'reader{number}@yamdb.fake'
+            )
+            Review.objects.create(
+                author=author, title=title, text='Отзыв', score=number + 1
+            )
+            Comment.objects.create(
+                author=author, reviews=review, text='Комментарий'
+            )
+        # Первый запрос кладёт администратора в кэш пользователей.
+        admin_client.get(data['reviews'])
+        for url_name, queries in (('reviews', 3), ('comments', 2)):
+            with django_assert_num_queries(queries):
+                response = admin_client.get(data[url_name])
+            assert len(response.json()['results']) == 6, (
+                f'Проверьте, что список `{data[url_name]}` загружает '
+                'авторов тем же запросом, что и объекты.'
+            )
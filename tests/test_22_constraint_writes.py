@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ConstraintWrites:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    def test_01_duplicate_review(self, user_client, user,
+                                 django_assert_max_num_queries):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Первый', 'score': 7})
+        with django_assert_max_num_queries(6):
+            response = user_client.post(
+                url, data={'text': 'Второй', 'score': 1}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставляли отзыв на это произведение.'
+        ]}, (
+            'Проверьте, что повторный отзыв отклоняется по ограничению '
+            'уникальности с прежним текстом ошибки.'
+        )
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (1, 7)
+        assert Review.objects.count() == 1
+
+    def user_statements(self, client, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.SIGNUP_URL, data=data)
+        assert response.status_code == HTTPStatus.OK
+        return [
+            query['sql'].split()[0] for query in context.captured_queries
+            if '"users_account"' in query['sql']
+        ]
+
+    def test_02_signup_conflicts(self, client, django_user_model):
+        data = {'username': 'reader', 'email': 'reader@yamdb.fake'}
+        assert self.user_statements(client, data) == ['INSERT'], (
+            'Проверьте, что новый пользователь создаётся одной вставкой '
+            'без предварительных проверок.'
+        )
+        assert self.user_statements(client, data) == ['INSERT', 'SELECT']
+        assert django_user_model.objects.count() == 1
+
+        django_user_model.objects.create(
+            username='writer', email='writer@yamdb.fake'
+        )
+        cases = (
+            ({'username': 'reader', 'email': 'other@yamdb.fake'},
+             {'username'}),
+            ({'username': 'other', 'email': 'reader@yamdb.fake'},
+             {'email'}),
+            ({'username': 'reader', 'email': 'writer@yamdb.fake'},
+             {'username', 'email'}),
+        )
+        for payload, fields in cases:
+            response = client.post(self.SIGNUP_URL, data=payload)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert set(response.json()) == fields, (
+                'Проверьте, что конфликт уникальности при регистрации '
+                'сообщает о занятых полях.'
+            )
+        assert django_user_model.objects.count() == 2
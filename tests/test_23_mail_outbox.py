@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+from time import monotonic, sleep
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from users import outbox
+from users.models import OutgoingMail
+
+
+def wait_for(condition, timeout=5):
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, 'Фоновый поток не успел отправить.'
+        sleep(0.02)
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23MailOutbox:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    @pytest.fixture
+    def worker_mode(self, settings):
+        settings.MAIL_OUTBOX_DELIVERY = outbox.WORKER
+        return settings
+
+    def test_01_worker_drains_outbox(self, client, worker_mode):
+        response = client.post(self.SIGNUP_URL, data={
+            'username': 'reader', 'email': 'reader@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что в режиме worker письмо не отправляется '
+            'в запросе, а ставится в очередь.'
+        )
+        queued = OutgoingMail.objects.get()
+        assert queued.recipient == 'reader@yamdb.fake'
+
+        call_command('send_mail_outbox', stdout=StringIO())
+        assert [message.to for message in mail.outbox] == [
+            ['reader@yamdb.fake']
+        ]
+        queued.refresh_from_db()
+        assert queued.sent_at is not None
+
+    def test_02_batch_uses_one_connection(self, worker_mode):
+        worker_mode.EMAIL_BACKEND = f'{__name__}.CountingBackend'
+        CountingBackend.opened = 0
+        outbox.enqueue('Тема', 'Текст', [
+            f'user{number}@yamdb.fake' for number in range(3)
+        ])
+        assert outbox.send_pending() == (3, 0)
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, worker_mode):
+        worker_mode.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        outbox.enqueue('Тема', 'Текст', ['reader@yamdb.fake'])
+        assert outbox.send_pending() == (0, 1)
+        queued = OutgoingMail.objects.get()
+        assert queued.attempts == 1 and 'SMTP' in queued.last_error
+        assert queued.send_after > timezone.now(), (
+            'Проверьте, что неудачное письмо откладывается на паузу.'
+        )
+        assert outbox.send_pending() == (0, 0)
+
+        worker_mode.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        OutgoingMail.objects.update(
+            send_after=timezone.now() - timedelta(seconds=1)
+        )
+        assert outbox.send_pending() == (1, 0)
+        assert len(mail.outbox) == 1
+        assert outbox.retry_delay(2) == 2 * outbox.retry_delay(1)
+
+    def test_04_rolled_back_mail_is_not_sent(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                outbox.enqueue('Тема', 'Текст', ['reader@yamdb.fake'])
+                raise RuntimeError
+        assert not OutgoingMail.objects.exists()
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо не уходит, если транзакция откатилась.'
+        )
+
+    def test_05_concurrent_workers_claim_rows(self, worker_mode):
+        outbox.enqueue('Тема', 'Текст', ['reader@yamdb.fake'])
+        now = timezone.now()
+        first = list(outbox.pending(now))
+        second = list(outbox.pending(now))
+        assert len(outbox.claim(first, now)) == 1
+        assert outbox.claim(second, now) == [], (
+            'Проверьте, что письмо, забранное одним обработчиком, не '
+            'отправляет другой.'
+        )
+        assert outbox.send_pending() == (0, 0)
+
+    def test_06_thread_delivery(self, client, settings):
+        settings.MAIL_OUTBOX_DELIVERY = outbox.THREAD
+        with patch.object(outbox.sender, 'notify') as notify:
+            response = client.post(self.SIGNUP_URL, data={
+                'username': 'reader', 'email': 'reader@yamdb.fake'
+            })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что в режиме thread запрос регистрации не '
+            'отправляет письмо сам.'
+        )
+        notify.assert_called_once()
+
+    def test_07_thread_drains_and_retries(self, settings):
+        settings.MAIL_OUTBOX_DELIVERY = outbox.THREAD
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        sender = outbox.OutboxSender(interval=0.05)
+        try:
+            with patch.object(outbox, 'sender', sender):
+                outbox.enqueue('Тема', 'Текст', ['first@yamdb.fake'])
+                wait_for(lambda: OutgoingMail.objects.filter(
+                    attempts=1
+                ).exists())
+                settings.EMAIL_BACKEND = (
+                    'django.core.mail.backends.locmem.EmailBackend'
+                )
+                OutgoingMail.objects.update(send_after=timezone.now())
+                outbox.enqueue('Тема', 'Текст', ['second@yamdb.fake'])
+                wait_for(lambda: len(mail.outbox) == 2)
+        finally:
+            sender.stop(timeout=5)
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            'first@yamdb.fake', 'second@yamdb.fake'
+        ], (
+            'Проверьте, что фоновый поток отправляет все письма, которые '
+            'пора отправить, включая повторы.'
+        )
@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.tokens import VERSION_KEY, access_token_for, revoke_tokens
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}'
+    )
+    return client
+
+
+def user_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    queries = [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "users_account"' in query['sql']
+    ]
+    return response, queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24StatelessAuth:
+
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_token_claims(self, client, user):
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': user.generate_confirmation_code(),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert (token['role'], token['is_staff'], token['token_version']) == (
+            'user', False, 0
+        ), (
+            'Проверьте, что токен содержит роль, статус администратора '
+            'и версию токенов пользователя.'
+        )
+
+    def test_02_no_user_query(self, admin):
+        client = client_for(admin)
+        response, queries = user_queries(
+            client, 'post', self.GENRES_URL,
+            data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response, queries = user_queries(
+            client, 'delete', f'{self.GENRES_URL}drama/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert queries == [], (
+            'Проверьте, что пользователь из токена с утверждениями '
+            'не загружается из базы.'
+        )
+
+    def test_03_role_change_revokes_token(self, admin):
+        client = client_for(admin)
+        data = {'name': 'Драма', 'slug': 'drama'}
+        assert client.post(
+            self.GENRES_URL, data=data
+        ).status_code == HTTPStatus.CREATED
+        admin.role = 'user'
+        admin.save()
+        assert client.post(
+            self.GENRES_URL, data={'name': 'Комедия', 'slug': 'comedy'}
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что смена роли делает старый токен недействительным.'
+        )
+        assert client_for(admin).post(
+            self.GENRES_URL, data={'name': 'Комедия', 'slug': 'comedy'}
+        ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_revoke_and_delete(self, user, admin):
+        client = client_for(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        revoke_tokens(user)
+        assert client.get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+
+        client = client_for(admin)
+        admin.delete()
+        assert client.get(
+            self.GENRES_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_05_version_cached_before_commit(self, admin):
+        client = client_for(admin)
+        key = VERSION_KEY.format(user_id=admin.pk)
+        with transaction.atomic():
+            admin.is_active = False
+            admin.save()
+            # Параллельный запрос до фиксации читает старую версию.
+            cache.set(key, admin.token_version)
+        assert client.get(
+            self.GENRES_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что кэш версии токенов сбрасывается после фиксации '
+            'транзакции.'
+        )
+
+        admin.is_active = True
+        admin.save()
+        user_client = client_for(admin)
+        with transaction.atomic():
+            revoke_tokens(admin)
+            cache.set(key, admin.token_version)
+        assert user_client.get(
+            self.GENRES_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED
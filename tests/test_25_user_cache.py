@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from users.cache import UserCache, accounts
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25UserCache:
+
+    ME_URL = '/api/v1/users/me/'
+    GENRES_URL = '/api/v1/genres/'
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        accounts.clear()
+
+    def test_01_repeated_requests_hit_cache(self, admin_client, admin,
+                                            django_assert_num_queries):
+        response = admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        with django_assert_num_queries(2):
+            response = admin_client.post(
+                self.GENRES_URL, data={'name': 'Комедия', 'slug': 'comedy'}
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что повторный запрос не загружает пользователя '
+            'из базы.'
+        )
+        stats = accounts.stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (
+            1, 1, 0.5
+        )
+
+    def test_02_save_and_delete_invalidate(self, admin_client, admin):
+        data = {'name': 'Драма', 'slug': 'drama'}
+        assert admin_client.post(
+            self.GENRES_URL, data=data
+        ).status_code == HTTPStatus.CREATED
+        admin.role = 'user'
+        admin.save()
+        assert admin_client.delete(
+            f'{self.GENRES_URL}drama/'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что сохранение пользователя сбрасывает его в кэше.'
+        )
+        admin.delete()
+        assert admin_client.get(
+            self.ME_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_copies_and_lru_eviction(self):
+        cache = UserCache(maxsize=2, timeout=60)
+        first = cache.get(1, lambda: {'id': 1})
+        first['id'] = 0
+        assert cache.get(1, lambda: None) == {'id': 1}, (
+            'Проверьте, что кэш отдаёт копии пользователей.'
+        )
+        cache.get(2, lambda: {'id': 2})
+        cache.get(1, lambda: None)
+        cache.get(3, lambda: {'id': 3})
+        assert cache.get(2, lambda: 'загружен') == 'загружен', (
+            'Проверьте, что вытесняется давно не использованный '
+            'пользователь.'
+        )
+        assert cache.stats()['size'] == 2
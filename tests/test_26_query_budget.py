@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern
+
+from api.middleware import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+from api.urls import router_v1, urlpatterns
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre)
+
+PAGE_SIZES = (1, 10, 100)
+ROWS = max(PAGE_SIZES) + 1
+
+# Имя маршрута api.urls -> (метод, путь, наибольшее число запросов).
+# Бюджет не зависит от размера страницы: рост числа запросов вместе
+# со страницей означает N+1. Первый запрос — загрузка администратора
+# по токену; у titles-bulk на 100 произведений связи с жанрами
+# вставляются двумя пачками из-за лимита параметров SQLite.
+BUDGETS = {
+    'api-root': ('get', '/api/v1/', 1),
+    'signup': ('post', '/api/v1/auth/signup/', 7),
+    'token': ('post', '/api/v1/auth/token/', 2),
+    'autocomplete': ('get', '/api/v1/autocomplete/?q=Фильм', 4),
+    'stats': ('get', '/api/v1/_stats/', 1),
+    'stats-prometheus': ('get', '/api/v1/_stats/prometheus/', 1),
+    'users-list': ('get', '/api/v1/users/', 3),
+    'users-me': ('get', '/api/v1/users/me/', 2),
+    'users-detail': ('get', '/api/v1/users/reader0/', 2),
+    'categories-list': ('get', '/api/v1/categories/', 3),
+    'categories-detail': ('delete', '/api/v1/categories/category0/', 6),
+    'genres-list': ('get', '/api/v1/genres/', 3),
+    'genres-detail': ('delete', '/api/v1/genres/genre0/', 8),
+    'titles-list': ('get', '/api/v1/titles/', 6),
+    'titles-bulk': ('post', '/api/v1/titles/bulk/', 10),
+    'titles-detail': ('get', '/api/v1/titles/{title}/', 6),
+    'titles-rating-stats': (
+        'get', '/api/v1/titles/{title}/rating-stats/', 3
+    ),
+    'reviews-list': ('get', '/api/v1/titles/{title}/reviews/', 4),
+    'reviews-detail': (
+        'get', '/api/v1/titles/{title}/reviews/{review}/', 2
+    ),
+    'comments-list': (
+        'get', '/api/v1/titles/{title}/reviews/{review}/comments/', 3
+    ),
+    'comments-detail': (
+        'get',
+        '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/', 2
+    ),
+}
+
+
+def route_names():
+    return {pattern.name for pattern in router_v1.urls} | {
+        pattern.name for pattern in urlpatterns
+        if isinstance(pattern, URLPattern)
+    }
+
+
+@pytest.fixture
+def data(admin, django_user_model):
+    """По ROWS объектов каждого вида: больше самой крупной страницы."""
+    authors = django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+        )
+        for number in range(ROWS)
+    )
+    categories = Category.objects.bulk_create(
+        Category(name=f'Фильм {number}', slug=f'category{number}')
+        for number in range(ROWS)
+    )
+    genres = Genre.objects.bulk_create(
+        Genre(name=f'Жанр {number}', slug=f'genre{number}')
+        for number in range(ROWS)
+    )
+    titles = Title.objects.bulk_create(
+        Title(
+            name=f'Фильм {number}', year=2000, category=categories[number]
+        )
+        for number in range(ROWS)
+    )
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genre)
+        for title in titles for genre in genres[:3]
+    )
+    title = titles[0]
+    reviews = Review.objects.bulk_create(
+        Review(author=author, title=title, text='Отзыв', score=5)
+        for author in authors
+    )
+    comments = Comment.objects.bulk_create(
+        Comment(author=author, reviews=reviews[0], text='Комментарий')
+        for author in authors
+    )
+    return {
+        'admin': admin,
+        'title': title.id,
+        'review': reviews[0].id,
+        'comment': comments[0].id,
+    }
+
+
+def request_kwargs(name, page_size, data):
+    if name == 'signup':
+        return {'data': {'username': 'newbie', 'email': 'newbie@yamdb.fake'}}
+    if name == 'token':
+        return {'data': {
+            'username': data['admin'].username,
+            'confirmation_code': data['admin'].generate_confirmation_code(),
+        }}
+    if name == 'titles-bulk':
+        return {'format': 'json', 'data': [
+            {'name': f'Новинка {number}', 'year': 2024,
+             'category': 'category1', 'genre': ['genre1', 'genre2']}
+            for number in range(page_size)
+        ]}
+    return {'data': {'page_size': page_size}} if name.endswith('list') else {}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26QueryBudget:
+
+    def test_00_every_route_has_budget(self):
+        assert route_names() == set(BUDGETS), (
+            'Проверьте, что для каждого маршрута api.urls задан бюджет '
+            'запросов к базе.'
+        )
+
+    @pytest.mark.parametrize('page_size', PAGE_SIZES)
+    @pytest.mark.parametrize('name', sorted(BUDGETS))
+    def test_01_route_budget(self, admin_client, data, name, page_size,
+                             django_assert_max_num_queries, settings):
+        # Письма регистрации отправляются вне запроса, как в режиме
+        # по умолчанию.
+        settings.MAIL_OUTBOX_DELIVERY = 'worker'
+        method, url, budget = BUDGETS[name]
+        url = url.format(**data)
+        with django_assert_max_num_queries(budget):
+            response = getattr(admin_client, method)(
+                url, **request_kwargs(name, page_size, data)
+            )
+        assert response.status_code < HTTPStatus.BAD_REQUEST, (
+            f'Проверьте ответ на {method.upper()}-запрос к `{url}`.'
+        )
+
+    def test_02_middleware_headers(self, client, data, settings):
+        settings.QUERY_COUNT_HEADERS = True
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/categories/')
+        assert response[QUERY_COUNT_HEADER] == str(
+            len(context.captured_queries)
+        ), (
+            'Проверьте, что заголовок X-DB-Query-Count содержит число '
+            'запросов к базе.'
+        )
+        assert float(response[QUERY_TIME_HEADER]) >= 0
+
+        settings.QUERY_COUNT_HEADERS = False
+        response = client.get('/api/v1/categories/')
+        assert QUERY_COUNT_HEADER not in response
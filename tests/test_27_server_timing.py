@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from api import timing
+from reviews.models import Category, Genre, Title
+
+
+def stages(response):
+    return {
+        part.split(';')[0].strip()
+        for part in response['Server-Timing'].split(',')
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        for year in (1972, 1979):
+            title = Title.objects.create(
+                name=f'Фильм {year}', year=year, category=category
+            )
+            title.genre.set([genre])
+
+    def test_01_header_and_log(self, admin_client, titles, settings,
+                               caplog):
+        settings.SERVER_TIMING = True
+        with caplog.at_level(logging.INFO, logger='api.middleware'):
+            response = admin_client.get(self.TITLES_URL)
+        assert {
+            timing.DB, timing.SERIALIZE, timing.RENDER,
+            timing.PERMISSIONS, timing.TOTAL
+        } <= stages(response), (
+            'Проверьте, что заголовок Server-Timing содержит время базы, '
+            'сериализации, рендеринга и проверки прав.'
+        )
+        record = caplog.records[-1]
+        assert record.path == self.TITLES_URL and record.status == 200
+        assert set(record.timings) == stages(response), (
+            'Проверьте, что время этапов пишется в лог полем `timings`.'
+        )
+
+    def test_02_disabled(self, client, titles, settings):
+        settings.SERVER_TIMING = False
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что без настройки SERVER_TIMING заголовок '
+            'не добавляется.'
+        )
+        assert timing.span(timing.DB) is timing.NULL_SPAN
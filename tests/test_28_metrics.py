@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.metrics import EndpointMetrics, registry
+from users import cache as user_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Metrics:
+
+    STATS_URL = '/api/v1/_stats/'
+    PROMETHEUS_URL = '/api/v1/_stats/prometheus/'
+
+    @pytest.fixture(autouse=True)
+    def empty_registry(self):
+        registry.clear()
+
+    def test_01_stats_by_action(self, admin_client, client):
+        for _ in range(2):
+            assert client.get('/api/v1/titles/').status_code == HTTPStatus.OK
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        client.get('/api/v1/titles/0/')
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['endpoints']
+        assert stats['TitleViewSet.list']['count'] == 2, (
+            'Проверьте, что запросы учитываются по действию вьюсета.'
+        )
+        assert set(stats['TitleViewSet.list']['latency_ms']) == {
+            'p50', 'p95', 'p99'
+        }
+        assert stats['GenreViewSet.create']['status']['2xx'] == 1
+        assert stats['TitleViewSet.retrieve']['status']['4xx'] == 1
+
+    def test_02_prometheus(self, admin_client, client):
+        client.get('/api/v1/titles/')
+        response = admin_client.get(self.PROMETHEUS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert (
+            'api_request_duration_seconds_bucket'
+            '{endpoint="TitleViewSet.list",le="+Inf"} 1'
+        ) in text, (
+            'Проверьте, что гистограммы выводятся в формате Prometheus.'
+        )
+        assert (
+            'api_responses_total{endpoint="TitleViewSet.list",'
+            'status="2xx"} 1'
+        ) in text
+
+    def test_03_admin_only(self, user_client, client):
+        for url in (self.STATS_URL, self.PROMETHEUS_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_quantiles(self):
+        metrics = EndpointMetrics()
+        for _ in range(90):
+            metrics.observe(0.003, 200, 100)
+        for _ in range(10):
+            metrics.observe(0.3, 500, 100)
+        summary = metrics.summary()
+        assert 2.5 <= summary['latency_ms']['p50'] <= 5
+        assert 250 <= summary['latency_ms']['p99'] <= 500, (
+            'Проверьте расчёт квантилей по корзинам гистограммы.'
+        )
+        assert summary['status']['5xx'] == 10
+
+    def test_05_cache_stats(self, admin_client, client):
+        user_cache.accounts.clear()
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        caches = admin_client.get(self.STATS_URL).json()['caches']
+        assert caches['responses']['genres']['hits'] >= 1, (
+            'Проверьте, что в /api/v1/_stats/ есть попадания кэша ответов.'
+        )
+        assert set(caches['users']) == {
+            'hits', 'misses', 'hit_rate', 'size', 'maxsize'
+        }, 'Проверьте, что в /api/v1/_stats/ есть статистика кэша '\
+            'пользователей.'
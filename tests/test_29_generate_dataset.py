@@ -0,0 +1,88 @@
+import csv
+import os
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Max, Sum
+
+from reviews.models import Comment, Review, Title, TitleGenre, User
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'api_yamdb', 'static', 'data'
+)
+SIZES = (
+    '--users', '40', '--categories', '3', '--genres', '6',
+    '--titles', '60', '--reviews', '500', '--comments', '200',
+)
+
+
+def generate(*args):
+    call_command('generate_dataset', *SIZES, *args, stdout=StringIO())
+
+
+def read_csv(directory, filename):
+    with open(os.path.join(directory, filename), encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29GenerateDataset:
+
+    def test_01_csv_is_deterministic(self, tmp_path):
+        generate('--csv', str(tmp_path / 'first'), '--seed', '7')
+        generate('--csv', str(tmp_path / 'second'), '--seed', '7')
+        generate('--csv', str(tmp_path / 'other'), '--seed', '8')
+        filenames = sorted(os.listdir(tmp_path / 'first'))
+        assert filenames == sorted(
+            name for name in os.listdir(DATA_DIR) if name.endswith('.csv')
+        )
+        for filename in filenames:
+            first = read_csv(tmp_path / 'first', filename)
+            assert first == read_csv(tmp_path / 'second', filename), (
+                'Проверьте, что одинаковый seed даёт одинаковые данные.'
+            )
+            assert first[0] == read_csv(DATA_DIR, filename)[0], (
+                f'Проверьте, что колонки {filename} совпадают с import_csv.'
+            )
+        assert read_csv(tmp_path / 'first', 'review.csv') != read_csv(
+            tmp_path / 'other', 'review.csv'
+        )
+
+    def test_02_database(self, client):
+        generate('--batch-size', '50')
+        assert User.objects.count() == 40
+        assert Title.objects.count() == 60
+        assert Review.objects.count() == 500
+        assert Comment.objects.count() == 200
+        assert not TitleGenre.objects.values('title').annotate(
+            number=Count('id')
+        ).filter(number__gt=3).exists()
+        assert not Review.objects.values('author', 'title').annotate(
+            number=Count('id')
+        ).filter(number__gt=1).exists(), (
+            'Проверьте, что автор оставляет не больше одного отзыва '
+            'на произведение.'
+        )
+        assert Title.objects.aggregate(
+            total=Sum('reviews_count')
+        )['total'] == 500, (
+            'Проверьте, что после генерации пересчитываются рейтинги.'
+        )
+        assert Title.objects.aggregate(
+            top=Max('reviews_count')
+        )['top'] >= 3 * 500 / 60, (
+            'Проверьте, что отзывы скошены к популярным произведениям.'
+        )
+        authors = Counter(Review.objects.values_list('author_id', flat=True))
+        assert max(authors.values()) >= 2 * 500 / 40
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 60
+
+    def test_03_appends_after_existing_rows(self):
+        generate()
+        generate('--seed', '1')
+        assert Review.objects.count() == 1000
+        assert User.objects.count() == 80